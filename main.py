@@ -5,7 +5,7 @@ import os
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import stripe
 
@@ -13,6 +13,7 @@ from fastapi import FastAPI, Request, UploadFile, File
 from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 from dotenv import load_dotenv
 
@@ -251,7 +252,10 @@ async def auth_callback(request: Request):
 
 @app.get("/auth/logout")
 async def auth_logout(request: Request):
+    from services.match_key_cache import delete_key_cache
+
     session_id = request.session.get("session_key")
+    delete_key_cache(request.session.get("user_key"))
     creds = credentials_from_session(request)
     if creds:
         revoke_credentials(creds)
@@ -264,6 +268,10 @@ async def auth_logout(request: Request):
     return RedirectResponse("/")
 
 
+# Uploads producing more cards than this (PDF pages count one each) must fit the user's remaining quota.
+MAX_CARDS_PER_UPLOAD = 5
+
+
 @app.post("/upload")
 async def upload(request: Request, files: List[UploadFile] = File(...)):
     if not request.session.get("user_key"):
@@ -274,18 +282,19 @@ async def upload(request: Request, files: List[UploadFile] = File(...)):
         request.session["flash_error"] = "請選擇至少 1 張名片。"
         return RedirectResponse("/", status_code=303)
 
-    if len(files) > 5:
-        request.session["flash_error"] = "一次最多處理 5 張名片。"
+    if len(files) > MAX_CARDS_PER_UPLOAD:
+        request.session["flash_error"] = f"一次最多處理 {MAX_CARDS_PER_UPLOAD} 張名片。"
         return RedirectResponse("/", status_code=303)
 
-    from services.ocr_service import extract_text
-    from services.parse_service import parse_text_to_schema
+    from services.parse_service import parse_many
+    from services.parse_timing import StageTimings, timings_enabled
+    from services.pdf_service import PdfError
+    from services.upload_pipeline import count_cards, dedupe_and_ocr
 
     session_id = ensure_session_id(request)
     batch_id = uuid.uuid4().hex
 
     data_list: List[Dict[str, Any]] = []
-    ocr_list: List[str] = []
     file_names: List[str] = []
     upload_paths: List[str] = []
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -305,15 +314,52 @@ async def upload(request: Request, files: List[UploadFile] = File(...)):
         path = UPLOAD_DIR / stored_name
         path.write_bytes(content)
 
-        ocr_text = extract_text(str(path))
-        parsed = parse_text_to_schema(ocr_text)
-        parsed["notes"] = f"名片掃描於 {timestamp}，來源：上傳（檔名：{upload.filename}）"
-
-        data_list.append(parsed)
-        ocr_list.append(ocr_text)
         file_names.append(upload.filename or stored_name)
         upload_paths.append(str(path))
 
+    # Each PDF page becomes its own card. Pages are counted before anything is rendered: a batch past
+    # MAX_CARDS_PER_UPLOAD (a long scanned PDF) is only OCR'd if the user's quota covers every card.
+    user_key = request.session.get("user_key") or ""
+    error = None
+    try:
+        card_count = await run_in_threadpool(count_cards, upload_paths)
+        if card_count > MAX_CARDS_PER_UPLOAD and not billing.has_quota(user_key, card_count):
+            error = (
+                f"此次上傳共 {card_count} 張名片（PDF 每頁算一張），超過 {MAX_CARDS_PER_UPLOAD} 張時須有足夠的可用額度，"
+                "請先購買點數或分批上傳。"
+            )
+    except PdfError as exc:
+        print("[upload] failed to open PDF:", exc)
+        error = "無法讀取 PDF，請確認檔案未加密或損毀。"
+    if error:
+        for path_str in upload_paths:
+            Path(path_str).unlink(missing_ok=True)
+        request.session["flash_error"] = error
+        return RedirectResponse("/", status_code=303)
+
+    # Rendering and OCR are blocking work: run them off the event loop, pages streaming into OCR.
+    # Rendered pages are removed by dedupe_and_ocr itself if it fails.
+    try:
+        file_names, upload_paths, ocr_list, duplicates = await run_in_threadpool(
+            dedupe_and_ocr, user_key, file_names, upload_paths
+        )
+    except Exception as exc:
+        print("[upload] failed to render or OCR the batch:", exc)
+        for path_str in upload_paths:
+            Path(path_str).unlink(missing_ok=True)
+        request.session["flash_error"] = (
+            "無法讀取 PDF，請確認檔案未加密或損毀。" if isinstance(exc, PdfError) else "名片辨識失敗，請稍後再試。"
+        )
+        return RedirectResponse("/", status_code=303)
+
+    timings = StageTimings() if timings_enabled() else None
+    for parsed, file_name in zip(parse_many(ocr_list, hook=timings), file_names):
+        parsed["notes"] = f"名片掃描於 {timestamp}，來源：上傳（檔名：{file_name}）"
+        data_list.append(parsed)
+    if timings is not None:
+        timings.save_csv(str(LOG_DIR))
+
+    duplicate_of = {dup["index"]: dup["duplicate_of"] for dup in duplicates}
     draft_defaults = []
     for idx, parsed in enumerate(data_list):
         name = parsed.get("name") or {}
@@ -321,7 +367,7 @@ async def upload(request: Request, files: List[UploadFile] = File(...)):
         draft_defaults.append(
             {
                 "index": idx,
-                "skip": False,
+                "skip": idx in duplicate_of,
                 "fullName": name.get("fullName", ""),
                 "givenName": name.get("givenName", ""),
                 "familyName": name.get("familyName", ""),
@@ -347,6 +393,7 @@ async def upload(request: Request, files: List[UploadFile] = File(...)):
         "upload_paths": upload_paths,
         "order": list(range(len(data_list))),
         "draft": draft_defaults,
+        "duplicates": duplicates,
     }
     save_payload(session_id, batch_id, payload)
     request.session["active_batch_id"] = batch_id
@@ -381,24 +428,37 @@ async def review(request: Request):
     file_names: List[str] = payload.get("file_names") or []
     order = [int(x) for x in payload.get("order") or list(range(len(data_list)))]
     draft_lookup = _draft_lookup(payload)
+    duplicate_of = {int(dup.get("index", -1)): dup.get("duplicate_of") for dup in payload.get("duplicates") or []}
 
     user_key = request.session.get("user_key")
     dedupe_entries: List[Optional[Dict[str, Any]]] = [None] * len(data_list)
     if user_key:
         try:
             from services.people_service import PeopleService
-            from services.dedupe_service import decide_action
+            from services.contact_record import compact_people
+            from services.dedupe_service import ContactIndex, plan_batch
+            from services.match_key_cache import get_key_cache
 
             creds = credentials_from_session(request)
             if creds:
                 svc = PeopleService(creds)
-                existing = svc.list_connections(page_size=200)
-                for idx, data in enumerate(data_list):
-                    action, matched, _ = decide_action(data, existing)
-                    dedupe_entries[idx] = {
-                        "action": action,
-                        "resourceName": matched.get("resourceName") if matched else None,
-                    }
+                key_cache = get_key_cache(user_key)
+                existing = ContactIndex(compact_people(svc.iter_connections(page_size=200)), key_cache=key_cache)
+                if key_cache:
+                    key_cache.save()
+                # Plan in display order so the first card shown for a person is the one merged into.
+                for group in plan_batch([data_list[idx] for idx in order], existing):
+                    matched = group["matched"]
+                    primary = order[group["members"][0]]
+                    for pos in group["members"]:
+                        idx = order[pos]
+                        dedupe_entries[idx] = {
+                            "action": group["action"],
+                            "resourceName": matched.get("resourceName") if matched else None,
+                            "mergedInto": None if idx == primary else (
+                                file_names[primary] if primary < len(file_names) else f"名片 {primary + 1}"
+                            ),
+                        }
         except Exception:  # pragma: no cover - fail softly
             dedupe_entries = [None] * len(data_list)
 
@@ -444,6 +504,7 @@ async def review(request: Request):
                 "skip": bool(draft.get("skip")),
                 "ocr": ocr_list[idx] if idx < len(ocr_list) else "",
                 "dedupe": dedupe_entries[idx] if idx < len(dedupe_entries) else None,
+                "duplicate_of": duplicate_of.get(idx),
                 "filename": file_names[idx] if idx < len(file_names) else f"名片 {idx + 1}",
             }
         )
@@ -456,6 +517,7 @@ async def review(request: Request):
             "user_key": user_key,
             "total_items": len(entries),
             "order_json": json.dumps([entry["index"] for entry in entries]),
+            "duplicates": payload.get("duplicates") or [],
         },
     )
 
@@ -485,7 +547,9 @@ async def save_draft_endpoint(request: Request):
 @app.post("/apply")
 async def apply(request: Request):
     from services.phone_email_utils import normalize_phone, validate_email
-    from services.dedupe_service import decide_action
+    from services.contact_record import ContactRecord, compact_people
+    from services.dedupe_service import ContactIndex, cluster_cards, plan_batch
+    from services.match_key_cache import get_key_cache
     from services.people_service import PeopleService
     from services.log_service import LogSession
 
@@ -610,13 +674,24 @@ async def apply(request: Request):
             {"request": request, "results": results, "csv_filename": Path(csv_path).name},
         )
 
-    needed = sum(1 for item in parsed_items if not item["skip"])
+    # Cards of the same person are merged into one write, so quota is per person.
+    active = [item for item in parsed_items if not item["skip"]]
+    needed = len(cluster_cards([item["data"] for item in active]))
     if needed > 0 and not billing.has_quota(user_key, needed):
         request.session["flash_error"] = "可用額度不足，請先購買方案或點數。"
         return RedirectResponse("/billing", status_code=303)
 
     svc = PeopleService(creds)
-    existing = svc.list_connections(page_size=200)
+    key_cache = get_key_cache(user_key)
+    existing = ContactIndex(compact_people(svc.iter_connections(page_size=200)), key_cache=key_cache)
+    groups: Dict[int, Dict[str, Any]] = {}
+    merged_into: Dict[int, Dict[str, Any]] = {}
+    for group in plan_batch([item["data"] for item in active], existing):
+        primary = active[group["members"][0]]
+        groups[primary["index"]] = group
+        for pos in group["members"][1:]:
+            merged_into[active[pos]["index"]] = primary
+    written: Dict[int, Optional[str]] = {}
 
     for item in parsed_items:
         idx = item["index"]
@@ -636,8 +711,22 @@ async def apply(request: Request):
             results.append(row)
             continue
 
+        primary = merged_into.get(idx)
+        if primary is not None:
+            row.update({
+                "action": "merged",
+                "status": "merged",
+                "reason": f"與 {primary['filename']} 合併",
+                "resourceName": written.get(primary["index"]),
+                "photoStatus": "未處理（已合併）",
+            })
+            log.append({"timestamp": datetime.now().isoformat(timespec="seconds"), **row})
+            results.append(row)
+            continue
+
         try:
-            action, matched, _ = decide_action(data, existing)
+            group = groups[idx]
+            action, matched, data = group["action"], group["matched"], group["data"]
             row["action"] = action
             if action == "create":
                 res = svc.create_contact(data)
@@ -647,53 +736,42 @@ async def apply(request: Request):
                 if resource_name and photo_path:
                     photo_res = svc.update_contact_photo(resource_name, photo_path)
                     row["photoStatus"] = "已更新" if photo_res else "照片未更新"
-                existing.append(photo_res or res)
+                existing.upsert(ContactRecord.from_person(photo_res or res))
                 billing.deduct_quota(user_key, 1)
             elif action == "update" and matched:
-                resource_name = matched.get("resourceName") if isinstance(matched, dict) else None
+                resource_name = matched.get("resourceName")
                 if not resource_name:
                     row.update({"status": "failed", "reason": "找不到 resourceName"})
                 else:
-                    etag = matched.get("etag")
-                    if not etag:
-                        metadata = matched.get("metadata") or {}
-                        sources = metadata.get("sources") or []
-                        if sources:
-                            etag = sources[0].get("etag")
-                    res = svc.update_contact(resource_name, data, etag=etag)
+                    # The record keeps the etag from the snapshot; the contact is only re-read
+                    # if it changed since (etag conflict).
+                    res = svc.update_contact_or_refresh(resource_name, data, matched.get("etag"))
                     updated_resource = res.get("resourceName") or resource_name
                     row.update({"status": "success", "resourceName": updated_resource})
                     photo_res = None
                     if photo_path:
                         photo_res = svc.update_contact_photo(updated_resource, photo_path)
                         row["photoStatus"] = "已更新" if photo_res else "照片未更新"
-                    replaced = False
-                    for pos, person in enumerate(existing):
-                        if person.get("resourceName") == resource_name:
-                            existing[pos] = photo_res or res
-                            replaced = True
-                            break
-                    if not replaced:
-                        existing.append(photo_res or res)
+                    existing.upsert(ContactRecord.from_person(photo_res or res), resource_name)
                     billing.deduct_quota(user_key, 1)
             else:
                 row.update({"status": "ok", "reason": "完全相同"})
                 if matched and photo_path:
-                    resource_name = matched.get("resourceName") if isinstance(matched, dict) else None
+                    resource_name = matched.get("resourceName")
                     if resource_name:
                         photo_res = svc.update_contact_photo(resource_name, photo_path)
                         row["photoStatus"] = "已更新" if photo_res else "照片未更新"
                         if photo_res:
-                            for pos, person in enumerate(existing):
-                                if person.get("resourceName") == resource_name:
-                                    existing[pos] = photo_res
-                                    break
+                            existing.upsert(ContactRecord.from_person(photo_res), resource_name)
         except Exception as exc:
             row.update({"status": "failed", "reason": str(exc)})
         finally:
+            written[idx] = row.get("resourceName")
             log.append({"timestamp": datetime.now().isoformat(timespec="seconds"), **row})
             results.append(row)
 
+    if key_cache:
+        key_cache.save()
     csv_path = log.save_csv(str(LOG_DIR))
     for path_str in payload.get("upload_paths", []):
         try:
@@ -0,0 +1,240 @@
+"""Synthetic Google People API address books and matching business cards.
+
+Usage:
+    python scripts/contact_corpus.py --contacts 10000 --seed 1 > connections.jsonl
+    python scripts/contact_corpus.py --contacts 10000 --cards 200 --overlap 0.3 > cards.jsonl
+
+``generate_connections`` builds ``people.connections.list`` entries with the
+fields and metadata PeopleService.list_connections requests (names, emails,
+phones, organizations, addresses, urls, biographies, per-field and source
+metadata, etags). ``generate_candidates`` builds parsed cards (the
+parse_service schema) where ``overlap`` of them describe a contact already in
+the book: an exact copy, a copy with a new phone number, or an OCR-style variant
+(one character off in the name, another legal suffix on the company). Each card
+comes with the resourceName it should match, or None for new people. The same
+seed always produces the same data.
+"""
+import argparse
+import json
+import pathlib
+import random
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from scripts.card_corpus import CITY, EN_CITY, EN_STREET, FAMILY, FIRST, GIVEN, LAST, ROAD  # noqa: E402
+
+CJK_BRAND = [
+    "能量", "星河", "遠景", "宏達", "綠野", "晨光", "大同", "海洋", "金山", "東方", "新世紀", "永豐", "統聯", "全球",
+    "聯合", "太平洋", "信義", "長春", "華新", "中興", "光華", "台灣", "亞洲", "天成", "合眾", "鼎新", "萬通", "立德",
+]
+CJK_TRADE = ["科技", "資訊", "貿易", "設計", "生技", "精密", "物流", "電子", "建設", "國際", "光電", "食品"]
+CJK_FORM = ["股份有限公司", "有限公司", "股份公司", "企業社", ""]
+CJK_TITLE = ["總經理", "經理", "副理", "業務經理", "工程師", "資深工程師", "董事長", "設計師", "顧問", "專員"]
+EN_BRAND = [
+    "Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Soylent", "Cyberdyne",
+    "Tyrell", "Wonka", "Aperture", "Oscorp", "Massive", "Pied Piper", "Gringotts", "Monarch", "Nakatomi", "Zorg",
+]
+EN_TRADE = ["Labs", "Systems", "Foods", "Logistics", "Media", "Health", "Energy", "Robotics", "Capital", "Design"]
+EN_FORM = ["Inc.", "Co., Ltd.", "Corp.", "Ltd.", "LLC", ""]
+EN_TITLE = ["Sales Manager", "CTO", "Project Manager", "Software Engineer", "Director", "Account Manager", "CEO"]
+DOMAINS = [".com", ".com.tw", ".io", ".tw", ".example"]
+
+CJK_SHARE = 0.7
+
+
+def _mobile(rnd: random.Random) -> Tuple[str, str]:
+    digits = f"9{rnd.randrange(10**8):08d}"
+    return f"0{digits[:3]}-{digits[3:6]}-{digits[6:]}", f"+886{digits}"
+
+
+def _landline(rnd: random.Random) -> Tuple[str, str]:
+    num = f"{rnd.randrange(10**8):08d}"
+    return f"(02) {num[:4]}-{num[4:]}", f"+8862{num}"
+
+
+def _field_meta(contact_id: str, primary: bool = False) -> Dict:
+    meta = {"source": {"type": "CONTACT", "id": contact_id}}
+    if primary:
+        meta["primary"] = True
+    return meta
+
+
+def _identity(rnd: random.Random) -> Dict:
+    """Name, company and contact details of one made-up person."""
+    if rnd.random() < CJK_SHARE:
+        family, given = rnd.choice(FAMILY), "".join(rnd.sample(GIVEN, 2))
+        brand = rnd.choice(CJK_BRAND) + rnd.choice(CJK_TRADE)
+        return {
+            "given": given, "family": family, "full": family + given,
+            "brand": brand, "company": brand + rnd.choice(CJK_FORM), "title": rnd.choice(CJK_TITLE),
+            "local": f"user{rnd.randrange(10**6)}",
+            "domain": f"tw{rnd.randrange(10**4)}{rnd.choice(DOMAINS)}",
+            "address": f"{rnd.choice(CITY)}{rnd.choice(ROAD)}{rnd.randrange(1, 400)}號{rnd.randrange(1, 25)}樓",
+        }
+    first, last = rnd.choice(FIRST), rnd.choice(LAST)
+    given = f"{first} {chr(65 + rnd.randrange(26))}."
+    brand = f"{rnd.choice(EN_BRAND)} {rnd.choice(EN_TRADE)}"
+    return {
+        "given": given, "family": last, "full": f"{given} {last}",
+        "brand": brand, "company": f"{brand} {rnd.choice(EN_FORM)}".strip(), "title": rnd.choice(EN_TITLE),
+        "local": f"{first.lower()}.{last.lower()}{rnd.randrange(1000)}",
+        "domain": brand.lower().replace(" ", "") + rnd.choice(DOMAINS),
+        "address": f"{rnd.randrange(1, 2000)} {rnd.choice(EN_STREET)}, {rnd.choice(EN_CITY)}",
+    }
+
+
+def _person(rnd: random.Random, idx: int, ident: Dict) -> Dict:
+    contact_id = f"c{rnd.getrandbits(60):x}{idx}"
+    etag = f"%Eg{rnd.getrandbits(64):016x}"
+    person: Dict = {
+        "resourceName": f"people/{contact_id}",
+        "etag": etag,
+        "metadata": {
+            "sources": [{
+                "type": "CONTACT",
+                "id": contact_id,
+                "etag": etag,
+                "updateTime": f"20{rnd.randrange(18, 26)}-{rnd.randrange(1, 13):02d}-{rnd.randrange(1, 29):02d}T08:00:00Z",
+            }],
+            "objectType": "PERSON",
+        },
+        "names": [{
+            "metadata": _field_meta(contact_id, True),
+            "displayName": ident["full"],
+            "familyName": ident["family"],
+            "givenName": ident["given"],
+            "displayNameLastFirst": f"{ident['family']}, {ident['given']}",
+            "unstructuredName": ident["full"],
+        }],
+    }
+    if rnd.random() < 0.85:
+        person["organizations"] = [{
+            "metadata": _field_meta(contact_id, True), "name": ident["company"], "title": ident["title"], "type": "work",
+        }]
+    phones = []
+    for make, kind in ((_mobile, "mobile"), (_landline, "work")):
+        if rnd.random() < (0.9 if kind == "mobile" else 0.4):
+            value, canonical = make(rnd)
+            phones.append({
+                "metadata": _field_meta(contact_id, not phones), "value": value, "canonicalForm": canonical,
+                "type": kind, "formattedType": kind.capitalize(),
+            })
+    if phones:
+        person["phoneNumbers"] = phones
+    if rnd.random() < 0.8:
+        person["emailAddresses"] = [{
+            "metadata": _field_meta(contact_id, True), "value": f"{ident['local']}@{ident['domain']}",
+            "type": "work", "formattedType": "Work",
+        }]
+    if rnd.random() < 0.3:
+        person["addresses"] = [{
+            "metadata": _field_meta(contact_id, True), "formattedValue": ident["address"], "type": "work", "formattedType": "Work",
+        }]
+    if rnd.random() < 0.3:
+        person["urls"] = [{"metadata": _field_meta(contact_id, True), "value": f"https://www.{ident['domain']}", "type": "work"}]
+    if rnd.random() < 0.2:
+        person["biographies"] = [{
+            "metadata": _field_meta(contact_id, True), "value": f"{rnd.randrange(2015, 2026)} 年展會交換名片", "contentType": "TEXT_PLAIN",
+        }]
+    return person
+
+
+def iter_connections(count: int, seed: int = 0) -> Iterator[Dict]:
+    """generate_connections one person at a time, like PeopleService.iter_connections."""
+    rnd = random.Random(seed)
+    for idx in range(count):
+        yield _person(rnd, idx, _identity(rnd))
+
+
+def generate_connections(count: int, seed: int = 0) -> List[Dict]:
+    """``count`` People API person resources, as returned in ``connections``."""
+    return list(iter_connections(count, seed))
+
+
+def person_to_card(person: Dict) -> Dict:
+    """The parsed card a business card of ``person`` would produce."""
+    name = (person.get("names") or [{}])[0]
+    org = (person.get("organizations") or [{}])[0]
+    return {
+        "name": {"fullName": name.get("displayName", ""), "givenName": name.get("givenName", ""),
+                 "familyName": name.get("familyName", "")},
+        "organization": {"company": org.get("name", ""), "title": org.get("title", "")},
+        "phones": [{"type": "mobile", "value": p["canonicalForm"]} for p in person.get("phoneNumbers") or []],
+        "emails": [{"type": "work", "value": e["value"]} for e in person.get("emailAddresses") or []],
+        "addresses": [{"type": "work", "formatted": a["formattedValue"]} for a in person.get("addresses") or []],
+        "urls": [{"type": "work", "value": u["value"]} for u in person.get("urls") or []],
+        "notes": "",
+    }
+
+
+def _ocr_variant(rnd: random.Random, card: Dict) -> Dict:
+    name = card["name"]["fullName"]
+    company = card["organization"]["company"]
+    if rnd.random() < 0.5 and len(name) > 2:
+        pos = rnd.randrange(1, len(name))
+        name = name[:pos] + rnd.choice("abcdefghijklmnopqrstuvwxyz" if name.isascii() else GIVEN) + name[pos + 1:]
+    for old, new in (
+        ("股份有限公司", "股份公司"), ("有限公司", "股份有限公司"),
+        ("Co., Ltd.", "Ltd."), ("Ltd.", "Co., Ltd."), ("Inc.", "Inc"), ("Corp.", "Corporation"), ("LLC", "Inc."),
+    ):
+        if company.endswith(old):
+            company = company[: -len(old)] + new
+            break
+    else:
+        company = company + (" Inc." if company.isascii() else "有限公司")
+    card["name"] = dict(card["name"], fullName=name)
+    card["organization"] = dict(card["organization"], company=company)
+    return card
+
+
+def generate_candidates(
+    people: List[Dict],
+    count: int,
+    overlap: float = 0.3,
+    seed: int = 0,
+) -> List[Tuple[Dict, Optional[str]]]:
+    """``count`` (card, expected resourceName) pairs; ``overlap`` of them describe a contact in ``people``.
+
+    Only contacts with a name and company are drawn, since dedupe_service never
+    matches a card to a contact without both.
+    """
+    rnd = random.Random(seed + 7919)
+    known = [p for p in people if p.get("names") and p.get("organizations")]
+    out: List[Tuple[Dict, Optional[str]]] = []
+    for idx in range(count):
+        if known and rnd.random() < overlap:
+            person = rnd.choice(known)
+            card = person_to_card(person)
+            roll = rnd.random()
+            if roll < 0.4:
+                pass  # same card again
+            elif roll < 0.7:
+                card["phones"] = card["phones"] + [{"type": "mobile", "value": _mobile(rnd)[1]}]
+            else:
+                card = _ocr_variant(rnd, card)
+            out.append((card, person["resourceName"]))
+        else:
+            out.append((person_to_card(_person(rnd, idx, _identity(rnd))), None))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic People API connections or cards (JSON lines)")
+    parser.add_argument("--contacts", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cards", type=int, default=0, help="print this many cards instead of the contacts")
+    parser.add_argument("--overlap", type=float, default=0.3, help="share of cards matching an existing contact")
+    args = parser.parse_args()
+    people = generate_connections(args.contacts, args.seed)
+    if args.cards:
+        for card, expected in generate_candidates(people, args.cards, args.overlap, args.seed):
+            print(json.dumps({"card": card, "expected": expected}, ensure_ascii=False))
+    else:
+        for person in people:
+            print(json.dumps(person, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
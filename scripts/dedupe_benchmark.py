@@ -0,0 +1,135 @@
+"""Contact deduplication benchmark on synthetic address books.
+
+Usage:
+    python scripts/dedupe_benchmark.py [--contacts 1000,10000,100000] [--cards 200] [--overlap 0.3]
+    python scripts/dedupe_benchmark.py --no-fuzzy
+    python scripts/dedupe_benchmark.py --compact
+
+For each address-book size, generates People API connections and parsed cards
+with scripts/contact_corpus.py, then reports:
+  build        seconds to build the ContactIndex from the snapshot
+  p50/p95/p99  decide_action latency per card (includes compute_updates), in ms
+  batch        seconds for plan_batch over all cards
+  book/peak    MB held by the snapshot, and peak MB from loading it through
+               planning (tracemalloc, measured in a separate pass so timings
+               are unaffected)
+  hit/wrong/miss  cards matched to the expected contact, to another one, or not at all
+
+``--compact`` holds the snapshot as ContactRecords built while contacts stream
+in, as /review and /apply do, instead of full person dicts.
+"""
+import argparse
+import os
+import pathlib
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Sequence
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from scripts.contact_corpus import generate_candidates, generate_connections, iter_connections  # noqa: E402
+from services.contact_record import ContactRecord, compact_people  # noqa: E402
+from services.dedupe_service import ContactIndex, decide_action, plan_batch  # noqa: E402
+from services.phone_email_utils import clear_normalization_caches  # noqa: E402
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def measure_memory(contacts: int, cards: List[Dict], seed: int, compact: bool = False) -> Dict[str, float]:
+    clear_normalization_caches()
+    tracemalloc.start()
+    try:
+        if compact:
+            people = list(compact_people(iter_connections(contacts, seed)))
+        else:
+            people = generate_connections(contacts, seed)
+        book = tracemalloc.get_traced_memory()[0]
+        plan_batch(cards, ContactIndex(people))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"book_mb": book / 2**20, "peak_mb": peak / 2**20}
+
+
+def run(contacts: int, cards: int, overlap: float, seed: int = 1, compact: bool = False) -> Dict[str, float]:
+    people = generate_connections(contacts, seed)
+    pairs = generate_candidates(people, cards, overlap, seed)
+    candidates = [card for card, _ in pairs]
+    if compact:
+        people = [ContactRecord.from_person(p) for p in people]
+
+    clear_normalization_caches()
+    start = time.perf_counter()
+    index = ContactIndex(people)
+    build = time.perf_counter() - start
+
+    latencies = []
+    hit = wrong = miss = 0
+    for card, expected in pairs:
+        start = time.perf_counter()
+        _, matched, _ = decide_action(card, index)
+        latencies.append(time.perf_counter() - start)
+        got = matched.get("resourceName") if matched else None
+        if expected is None:
+            wrong += got is not None
+        elif got == expected:
+            hit += 1
+        elif got is None:
+            miss += 1
+        else:
+            wrong += 1
+
+    start = time.perf_counter()
+    plan_batch(candidates, index)
+    batch = time.perf_counter() - start
+
+    return {
+        "build_s": build,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "batch_s": batch,
+        **measure_memory(contacts, candidates, seed, compact),
+        "hit": hit,
+        "wrong": wrong,
+        "miss": miss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contacts", default="1000,10000,100000", help="comma separated address-book sizes")
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--overlap", type=float, default=0.3, help="share of cards matching an existing contact")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-fuzzy", action="store_true", help="exact name-company matching only (FUZZY_MATCH=off)")
+    parser.add_argument("--compact", action="store_true", help="hold contacts as ContactRecords instead of dicts")
+    args = parser.parse_args()
+    if args.no_fuzzy:
+        os.environ["FUZZY_MATCH"] = "off"
+
+    sizes = [int(x) for x in args.contacts.split(",") if x.strip()]
+    print(
+        f"cards={args.cards} overlap={args.overlap:.0%} fuzzy={'off' if args.no_fuzzy else 'on'} "
+        f"snapshot={'records' if args.compact else 'dicts'}"
+    )
+    header = ("contacts", "build s", "p50 ms", "p95 ms", "p99 ms", "batch s", "book MB", "peak MB", "hit/wrong/miss")
+    print("".join(f"{h:>16}" for h in header))
+    for size in sizes:
+        r = run(size, args.cards, args.overlap, args.seed, args.compact)
+        print(
+            f"{size:>16,}{r['build_s']:>16.2f}{r['p50_ms']:>16.3f}{r['p95_ms']:>16.3f}{r['p99_ms']:>16.3f}"
+            f"{r['batch_s']:>16.3f}{r['book_mb']:>16.1f}{r['peak_mb']:>16.1f}"
+            f"{r['hit']:>8}/{r['wrong']}/{r['miss']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
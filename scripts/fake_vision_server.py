@@ -0,0 +1,156 @@
+"""Local stand-in for the Vision ``images:annotate`` endpoint.
+
+Usage:
+    python scripts/fake_vision_server.py --port 8765 --latency 0.3 --jitter 0.1 --error-rate 0.05
+    VISION_ENDPOINT=http://127.0.0.1:8765/v1/images:annotate VISION_API_KEY=fake uvicorn main:app
+
+Each image in a request gets a canned ``fullTextAnnotation``. ``--responses`` may
+point to a JSON file with either a list of texts (picked by image hash) or an
+object mapping the SHA-256 of the decoded image bytes to a text. Failed calls
+(``--error-rate``) answer 503 like a throttled Vision backend.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+
+
+DEFAULT_TEXTS = [
+    "王大明 營運長\n能量叢林股份有限公司\nMobile: 0912-345-678\nEmail: dm.wang@example.com\n"
+    "https://example.com\n台北市大安區仁愛路三段 100 號",
+    "Jane Smith\nChief Technology Officer\nAcme International Inc.\nTel: +1 415-555-0100\n"
+    "jane.smith@acme.example\nhttps://acme.example",
+    "林小華 經理\n星河資訊科技有限公司\nTel: 02-2345-6789 / 0922-111-333\nhua.lin@galaxy.example\n"
+    "新北市板橋區文化路一段 1 號 10 樓",
+]
+
+
+class FakeVisionConfig:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        responses: Union[List[str], Dict[str, str], None] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.responses = responses or DEFAULT_TEXTS
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.images = 0
+        self.errors = 0
+
+    def text_for(self, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        if isinstance(self.responses, dict):
+            return self.responses.get(digest, "")
+        return self.responses[int(digest[:8], 16) % len(self.responses)]
+
+
+class FakeVisionHandler(BaseHTTPRequestHandler):
+    config: FakeVisionConfig = FakeVisionConfig()
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def do_POST(self):
+        cfg = self.config
+        length = int(self.headers.get("content-length") or 0)
+        body = self.rfile.read(length)
+        with cfg.lock:
+            cfg.calls += 1
+            delay = max(0.0, cfg.latency + cfg.random.uniform(-cfg.jitter, cfg.jitter))
+            fail = cfg.random.random() < cfg.error_rate
+        if not self.path.split("?", 1)[0].endswith("images:annotate"):
+            return self._send(404, {"error": {"code": 404, "message": "not found"}})
+        time.sleep(delay)
+        if fail:
+            with cfg.lock:
+                cfg.errors += 1
+            return self._send(cfg.error_status, {"error": {"code": cfg.error_status, "message": "fake throttling"}})
+        try:
+            requests_ = json.loads(body.decode("utf-8")).get("requests") or []
+        except ValueError:
+            return self._send(400, {"error": {"code": 400, "message": "invalid JSON"}})
+        responses = []
+        for entry in requests_:
+            try:
+                content = base64.b64decode((entry.get("image") or {}).get("content") or "")
+            except ValueError:
+                responses.append({"error": {"code": 3, "message": "bad image"}})
+                continue
+            text = cfg.text_for(content)
+            responses.append({"fullTextAnnotation": {"text": text}} if text else {})
+        with cfg.lock:
+            cfg.images += len(requests_)
+        self._send(200, {"responses": responses})
+
+    def _send(self, status: int, payload: Dict):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json; charset=utf-8")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **config) -> Tuple[ThreadingHTTPServer, str]:
+    """Run the fake in a background thread; returns (server, annotate URL). Call ``server.shutdown()``."""
+    handler = type("ConfiguredFakeVisionHandler", (FakeVisionHandler,), {"config": FakeVisionConfig(**config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/v1/images:annotate"
+
+
+def load_responses(path: Optional[str]):
+    if not path:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Vision images:annotate endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- seconds added to latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with an error")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--responses", help="JSON file with canned texts (list, or sha256 -> text)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server, url = start_server(
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        responses=load_responses(args.responses),
+        seed=args.seed,
+    )
+    print(f"Fake Vision listening on {url}")
+    print(f"Use: VISION_ENDPOINT={url} VISION_API_KEY=fake")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
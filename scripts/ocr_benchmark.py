@@ -0,0 +1,130 @@
+"""Offline OCR throughput benchmark against the fake Vision endpoint.
+
+Usage:
+    python scripts/ocr_benchmark.py [--cards 60] [--concurrency 1,4,16] [--latency 0.3] [--error-rate 0]
+
+Two workloads run at each concurrency level over a synthetic card corpus:
+  extract_text  one card per call, ``concurrency`` callers in parallel
+  pipeline      /upload's OCR + parse path on batches of 5 cards
+Reports cards/sec and p50/p95/p99 latency per call. Pass --endpoint to target an
+already running fake (scripts/fake_vision_server.py) instead of an in-process one.
+"""
+import argparse
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, List, Sequence
+
+from PIL import Image, ImageDraw, ImageFont
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from scripts.fake_vision_server import DEFAULT_TEXTS, start_server  # noqa: E402
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def make_card_images(count: int, workdir: str, seed: int = 0) -> List[str]:
+    """Synthetic card photos; each one is distinct so nothing is served from a cache."""
+    rnd = random.Random(seed)
+    font = ImageFont.load_default()
+    paths = []
+    for idx in range(count):
+        img = Image.new("RGB", (1200, 700), color=(rnd.randrange(220, 256),) * 3)
+        drw = ImageDraw.Draw(img)
+        for row, line in enumerate(DEFAULT_TEXTS[idx % len(DEFAULT_TEXTS)].splitlines()):
+            drw.text((60, 60 + row * 80), line.encode("ascii", "replace").decode(), fill="black", font=font)
+        drw.text((60, 640), f"#{idx}-{rnd.random():.6f}", fill="black", font=font)
+        buf = BytesIO()
+        img.save(buf, format="JPEG", quality=85)
+        path = pathlib.Path(workdir) / f"card_{idx}.jpg"
+        path.write_bytes(buf.getvalue())
+        paths.append(str(path))
+    return paths
+
+
+def run_level(jobs: List[List[str]], concurrency: int, fn: Callable[[List[str]], None]):
+    latencies: List[float] = []
+
+    def timed(job):
+        start = time.perf_counter()
+        fn(job)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, jobs))
+    return time.perf_counter() - start, latencies
+
+
+def report(label: str, concurrency: int, cards: int, wall: float, latencies: List[float]) -> None:
+    print(
+        f"{label:<13}{concurrency:>6}{cards / wall:>12.1f}"
+        f"{percentile(latencies, 50) * 1000:>10.0f}{percentile(latencies, 95) * 1000:>10.0f}"
+        f"{percentile(latencies, 99) * 1000:>10.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=60)
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--endpoint", help="URL of a running fake images:annotate endpoint")
+    parser.add_argument("--batch-size", type=int, default=5, help="cards per /upload batch")
+    args = parser.parse_args()
+
+    server = None
+    endpoint = args.endpoint
+    if not endpoint:
+        server, endpoint = start_server(
+            latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=1
+        )
+    # Configure before the services build their module-level clients.
+    os.environ["VISION_ENDPOINT"] = endpoint
+    os.environ["VISION_API_KEY"] = os.environ.get("VISION_API_KEY") or "fake"
+    os.environ["OCR_CACHE"] = "off"
+    os.environ["OCR_FALLBACK"] = "none"
+    os.environ.setdefault("VISION_BREAKER_FAILURE_RATE", "1.1")  # keep the breaker out of the numbers
+
+    from services.ocr_service import extract_text, extract_text_many
+    from services.parse_service import parse_text_to_schema
+
+    def pipeline(batch: List[str]) -> None:
+        for text in extract_text_many(batch):
+            parse_text_to_schema(text)
+
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+    print(f"fake Vision: {endpoint}  latency={args.latency}s±{args.jitter}s  error_rate={args.error_rate}")
+    print(f"OCR_MAX_WORKERS={os.getenv('OCR_MAX_WORKERS') or 4}  cards={args.cards}")
+    print(f"{'workload':<13}{'conc':>6}{'cards/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            paths = make_card_images(args.cards, workdir)
+            for concurrency in levels:
+                wall, lat = run_level([[p] for p in paths], concurrency, lambda job: extract_text(job[0]))
+                report("extract_text", concurrency, len(paths), wall, lat)
+            batches = [paths[i:i + args.batch_size] for i in range(0, len(paths), args.batch_size)]
+            for concurrency in levels:
+                wall, lat = run_level(batches, concurrency, pipeline)
+                report("pipeline", concurrency, len(paths), wall, lat)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
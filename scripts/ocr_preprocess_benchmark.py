@@ -0,0 +1,149 @@
+"""Compare raw vs preprocessed OCR uploads (bytes on the wire, Vision latency, text).
+
+Usage:
+    python scripts/ocr_preprocess_benchmark.py [image_or_dir ...] [--vision]
+
+Without paths a few synthetic 4000px "phone photos" of business cards are used.
+With --vision (and VISION_API_KEY set) each image is sent to Vision twice, raw and
+preprocessed, and the latency and text similarity are reported.
+"""
+import argparse
+import base64
+import difflib
+import json
+import os
+import pathlib
+import random
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+import requests
+from PIL import Image, ImageDraw, ImageFont
+from dotenv import load_dotenv
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+from services.ocr_service import prepare_image_bytes  # noqa: E402
+
+
+SAMPLE_LINES = [
+    ["王大明  營運長", "能量叢林股份有限公司", "Mobile: 0912-345-678", "dm.wang@example.com", "台北市大安區仁愛路三段 100 號"],
+    ["Jane Smith, CTO", "Acme International Inc.", "+1 415-555-0100", "jane@acme.example", "https://acme.example"],
+    ["林小華 經理", "星河資訊科技有限公司", "Tel: 02-2345-6789", "hua.lin@galaxy.example", "新北市板橋區文化路一段 1 號"],
+]
+
+
+def make_synthetic_photo(lines, size=(4000, 2400), seed=0) -> bytes:
+    rnd = random.Random(seed)
+    img = Image.new("RGB", size, color=(236, 232, 224))
+    drw = ImageDraw.Draw(img)
+    # Sensor-like noise so JPEG sizes resemble real photos rather than flat fills.
+    for _ in range(200_000):
+        x, y = rnd.randrange(size[0]), rnd.randrange(size[1])
+        v = rnd.randrange(200, 255)
+        drw.point((x, y), fill=(v, v - 5, v - 12))
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", 140)
+    except Exception:
+        font = ImageFont.load_default()
+    for row, line in enumerate(lines):
+        drw.text((300, 300 + row * 340), line, fill=(20, 20, 30), font=font)
+    buf = BytesIO()
+    img.save(buf, format="JPEG", quality=95)
+    return buf.getvalue()
+
+
+def collect_paths(args_paths, workdir):
+    paths = []
+    for raw in args_paths:
+        p = pathlib.Path(raw)
+        if p.is_dir():
+            paths.extend(sorted(str(x) for x in p.iterdir() if x.suffix.lower() in {".jpg", ".jpeg", ".png"}))
+        elif p.exists():
+            paths.append(str(p))
+    if paths:
+        return paths
+    for idx, lines in enumerate(SAMPLE_LINES):
+        path = pathlib.Path(workdir) / f"synthetic_{idx}.jpg"
+        path.write_bytes(make_synthetic_photo(lines, seed=idx))
+        paths.append(str(path))
+    return paths
+
+
+def annotate(content: bytes, api_key: str):
+    payload = {
+        "requests": [{
+            "image": {"content": base64.b64encode(content).decode("utf-8")},
+            "features": [{"type": "TEXT_DETECTION"}],
+        }]
+    }
+    body = json.dumps(payload)
+    start = time.perf_counter()
+    resp = requests.post(
+        f"https://vision.googleapis.com/v1/images:annotate?key={api_key}",
+        data=body,
+        headers={"content-type": "application/json"},
+        timeout=60,
+    )
+    elapsed = time.perf_counter() - start
+    text = ""
+    if resp.status_code == 200:
+        first = (resp.json().get("responses") or [{}])[0]
+        text = (first.get("fullTextAnnotation") or {}).get("text") or ""
+    return len(body), elapsed, text
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--vision", action="store_true", help="also call Vision (needs VISION_API_KEY)")
+    args = parser.parse_args()
+
+    api_key = os.getenv("VISION_API_KEY")
+    if args.vision and not api_key:
+        print("VISION_API_KEY is missing in environment")
+        raise SystemExit(2)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = collect_paths(args.paths, workdir)
+        raw_total = prep_total = 0
+        prep_times = []
+        latencies = {"raw": [], "prepared": []}
+        similarities = []
+        print(f"{'image':<28}{'raw KB':>10}{'prepared KB':>14}{'ratio':>8}{'prep ms':>10}")
+        for path in paths:
+            with open(path, "rb") as f:
+                raw = f.read()
+            start = time.perf_counter()
+            prepared = prepare_image_bytes(path)
+            prep_times.append((time.perf_counter() - start) * 1000)
+            raw_total += len(raw)
+            prep_total += len(prepared)
+            print(
+                f"{pathlib.Path(path).name[:27]:<28}{len(raw) / 1024:>10.1f}{len(prepared) / 1024:>14.1f}"
+                f"{len(prepared) / len(raw):>8.2f}{prep_times[-1]:>10.1f}"
+            )
+            if args.vision:
+                _, raw_s, raw_text = annotate(raw, api_key)
+                _, prep_s, prep_text = annotate(prepared, api_key)
+                latencies["raw"].append(raw_s)
+                latencies["prepared"].append(prep_s)
+                similarities.append(difflib.SequenceMatcher(None, raw_text, prep_text).ratio())
+
+        print()
+        print(f"Total on the wire (base64): raw {raw_total * 4 / 3 / 1024 / 1024:.2f} MB, "
+              f"prepared {prep_total * 4 / 3 / 1024 / 1024:.2f} MB "
+              f"({100 * (1 - prep_total / raw_total):.1f}% less)")
+        print(f"Preprocessing: median {statistics.median(prep_times):.1f} ms/image")
+        if args.vision:
+            print(f"Vision latency: raw median {statistics.median(latencies['raw']) * 1000:.0f} ms, "
+                  f"prepared median {statistics.median(latencies['prepared']) * 1000:.0f} ms")
+            print(f"Text similarity raw vs prepared: min {min(similarities):.3f}, "
+                  f"mean {statistics.mean(similarities):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Parser throughput benchmark and performance regression check.
+
+Usage:
+    python scripts/parse_benchmark.py [--cards 3000] [--repeat 9]
+    python scripts/parse_benchmark.py --check [--threshold 0.25]
+    python scripts/parse_benchmark.py --update-baseline
+
+Times parse_text_to_schema, guess_name, guess_company_title and parse_many on a
+seeded synthetic corpus (scripts/card_corpus.py) and reports cards/sec (best
+of ``--repeat`` runs after one warm-up) and the median relative throughput the
+check uses. Normalization caches are cleared before every run, so numbers
+reflect first-seen cards.
+
+Each run is paired with a fixed pure-Python calibration loop and throughput is
+also reported relative to it (cards per 1000 loop iterations), which keeps the
+baseline (scripts/parse_benchmark_baseline.json) roughly portable between
+machines. ``--check`` exits with status 1 when any function's median relative
+throughput drops more than ``--threshold`` (default PARSE_BENCH_THRESHOLD or
+0.25) below the baseline, plus a margin of twice the run-to-run noise measured
+in that same check. The margin is capped at the threshold itself, so a noisy
+run can at most double the allowed slowdown.
+"""
+import argparse
+import json
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from scripts.card_corpus import generate_cards  # noqa: E402
+from services.parse_service import (  # noqa: E402
+    guess_company_title,
+    guess_name,
+    parse_many,
+    parse_text_to_schema,
+)
+from services.phone_email_utils import clear_normalization_caches  # noqa: E402
+
+BASELINE_PATH = ROOT / "scripts" / "parse_benchmark_baseline.json"
+DEFAULT_REPEAT = 9
+NOISE_MARGIN = 2.0
+
+
+def calibrate(iterations: int = 100_000) -> float:
+    """Iterations/sec of a fixed string/dict workload."""
+    start = time.perf_counter()
+    seen: Dict[str, int] = {}
+    for idx in range(iterations):
+        key = str(idx % 997)
+        seen[key] = seen.get(key, 0) + len(key.strip())
+    return iterations / (time.perf_counter() - start)
+
+
+def measure(fn: Callable[[], object], items: int, repeat: int) -> Tuple[float, float, float]:
+    """(best cards/sec, median cards per 1000 calibration iterations, noise).
+
+    Pairing every run with a calibration run right before it cancels out CPU
+    frequency changes and noisy neighbours in the relative figure. One untimed
+    warm-up run comes first. ``noise`` is the spread of the relative figures
+    (scaled median absolute deviation) as a fraction of their median.
+    """
+    clear_normalization_caches()
+    fn()
+    rates, relative = [], []
+    for _ in range(repeat):
+        clear_normalization_caches()
+        calibration = calibrate()
+        start = time.perf_counter()
+        fn()
+        rate = items / (time.perf_counter() - start)
+        rates.append(rate)
+        relative.append(rate / calibration * 1000)
+    median = statistics.median(relative)
+    mad = statistics.median(abs(value - median) for value in relative)
+    return max(rates), median, 1.4826 * mad / median
+
+
+def run(cards: int, repeat: int, seed: int = 1) -> Dict[str, Tuple[float, float, float]]:
+    texts = generate_cards(cards, seed)
+    line_sets: List[List[str]] = [[ln.strip() for ln in t.splitlines() if ln.strip()] for t in texts]
+
+    def each(fn, inputs):
+        return lambda: [fn(x) for x in inputs]
+
+    return {
+        "parse_text_to_schema": measure(each(parse_text_to_schema, texts), cards, repeat),
+        "guess_name": measure(each(guess_name, line_sets), cards, repeat),
+        "guess_company_title": measure(each(guess_company_title, line_sets), cards, repeat),
+        "parse_many": measure(lambda: parse_many(texts, processes=1), cards, repeat),
+    }
+
+
+def allowance(threshold: float, noise: float) -> float:
+    """Allowed slowdown: ``threshold`` plus NOISE_MARGIN times ``noise``, the extra capped at ``threshold``."""
+    return threshold + min(NOISE_MARGIN * noise, threshold)
+
+
+def compare(
+    relative: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float,
+    noise: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """Names of functions whose relative throughput fell below the baseline by more than their allowance."""
+    noise = noise or {}
+    return [
+        name
+        for name, base in baseline.items()
+        if name in relative and relative[name] < base * (1 - allowance(threshold, noise.get(name, 0.0)))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--check", action="store_true", help="fail if slower than the stored baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=float(os.getenv("PARSE_BENCH_THRESHOLD") or 0.25),
+        help="allowed slowdown as a fraction of the baseline",
+    )
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.cards, args.repeat, args.seed)
+    relative = {name: rel for name, (_, rel, _) in results.items()}
+    noise = {name: spread for name, (_, _, spread) in results.items()}
+
+    print(f"cards={args.cards} repeat={args.repeat}")
+    print(f"{'function':<24}{'cards/s':>12}{'relative':>12}{'noise':>8}")
+    for name, (rate, rel, spread) in results.items():
+        print(f"{name:<24}{rate:>12,.0f}{rel:>12.3f}{spread:>8.1%}")
+
+    baseline_path = pathlib.Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps({
+            "python": platform.python_version(),
+            "cards": args.cards,
+            "seed": args.seed,
+            "relative": {name: round(value, 4) for name, value in relative.items()},
+        }, indent=2) + "\n", "utf-8")
+        print(f"baseline written to {baseline_path}")
+    if args.check:
+        baseline = json.loads(baseline_path.read_text("utf-8"))["relative"]
+        slower = compare(relative, baseline, args.threshold, noise)
+        for name in slower:
+            allowed = allowance(args.threshold, noise[name])
+            print(f"REGRESSION {name}: {relative[name]:.3f} < {baseline[name]:.3f} - {allowed:.0%}")
+        if slower:
+            sys.exit(1)
+        print(f"OK: within {args.threshold:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .people_service import person_etag
+
+
+def _intern(value: Optional[str]) -> str:
+    return sys.intern(value) if value else ""
+
+
+def _values(items: Optional[List[Dict]], key: str = "value") -> Tuple[str, ...]:
+    return tuple(it[key] for it in items or [] if it.get(key))
+
+
+class ContactRecord:
+    """The parts of a People API person that deduplication reads, in a few slots.
+
+    A full person dict from ``connections.list`` carries per-field metadata,
+    source ids, formatted types and display variants; this keeps the
+    resourceName, etag, first name and organization, and the phone, email, URL
+    and address values plus the first biography. Names, companies and titles
+    repeat across an address book and are interned.
+
+    ``get``/``[]`` answer with person-shaped values built on the fly, so
+    build_keys_from_person, compute_updates and the match-key cache read a
+    record exactly like the dict it came from. Updates are sent with the
+    record's etag (PeopleService.update_contact_or_refresh); the full person is
+    read again only when that etag is missing or stale.
+    """
+
+    __slots__ = (
+        "resource_name", "etag", "display_name", "given_name", "family_name",
+        "company", "title", "phones", "emails", "urls", "addresses", "note",
+    )
+
+    def __init__(
+        self,
+        resource_name: str,
+        etag: Optional[str] = None,
+        display_name: str = "",
+        given_name: str = "",
+        family_name: str = "",
+        company: str = "",
+        title: str = "",
+        phones: Tuple[str, ...] = (),
+        emails: Tuple[str, ...] = (),
+        urls: Tuple[str, ...] = (),
+        addresses: Tuple[str, ...] = (),
+        note: str = "",
+    ) -> None:
+        self.resource_name = resource_name
+        self.etag = etag
+        self.display_name = display_name
+        self.given_name = given_name
+        self.family_name = family_name
+        self.company = company
+        self.title = title
+        self.phones = phones
+        self.emails = emails
+        self.urls = urls
+        self.addresses = addresses
+        self.note = note
+
+    @classmethod
+    def from_person(cls, person: Dict) -> "ContactRecord":
+        name = (person.get("names") or [{}])[0]
+        org = (person.get("organizations") or [{}])[0]
+        return cls(
+            resource_name=person.get("resourceName") or "",
+            etag=person_etag(person),
+            display_name=_intern(name.get("displayName")),
+            given_name=_intern(name.get("givenName")),
+            family_name=_intern(name.get("familyName")),
+            company=_intern(org.get("name")),
+            title=_intern(org.get("title")),
+            phones=_values(person.get("phoneNumbers")),
+            emails=_values(person.get("emailAddresses")),
+            urls=_values(person.get("urls")),
+            addresses=_values(person.get("addresses"), "formattedValue"),
+            note=((person.get("biographies") or [{}])[0].get("value") or ""),
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "resourceName":
+            return self.resource_name or default
+        if key == "etag":
+            return self.etag or default
+        if key == "names":
+            if not (self.display_name or self.given_name or self.family_name):
+                return default
+            return [{"displayName": self.display_name, "givenName": self.given_name, "familyName": self.family_name}]
+        if key == "organizations":
+            if not (self.company or self.title):
+                return default
+            return [{"name": self.company, "title": self.title}]
+        if key == "phoneNumbers":
+            return [{"value": v} for v in self.phones] or default
+        if key == "emailAddresses":
+            return [{"value": v} for v in self.emails] or default
+        if key == "urls":
+            return [{"value": v} for v in self.urls] or default
+        if key == "addresses":
+            return [{"formattedValue": v} for v in self.addresses] or default
+        if key == "biographies":
+            return [{"value": self.note}] if self.note else default
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __repr__(self) -> str:
+        return f"ContactRecord({self.resource_name!r}, {self.display_name!r}, {self.company!r})"
+
+
+def compact_people(people: Iterable[Dict]) -> Iterator[ContactRecord]:
+    """ContactRecords for a stream of person dicts (e.g. PeopleService.iter_connections);
+    each dict can be freed as soon as its record is built."""
+    for person in people:
+        yield ContactRecord.from_person(person)
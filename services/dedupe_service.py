@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 from slugify import slugify
 
-from .phone_email_utils import normalize_phone, validate_email
+from .fuzzy_match import FuzzyBlockIndex, companies_close, fuzzy_enabled, fuzzy_text, within_one_edit
+from .phone_email_utils import dedupe_values, is_mobile_phone, normalize_phone, validate_email
 
 
 def build_keys_from_schema(data: Dict) -> Dict[str, List[str]]:
@@ -28,58 +29,342 @@ def build_keys_from_person(person: Dict) -> Dict[str, List[str]]:
         n = normalize_phone(v) if v else None
         if n:
             phones.append(n)
-    name = None
-    if person.get("names"):
-        name = person["names"][0].get("displayName") or person["names"][0].get("givenName")
-    company = None
-    if person.get("organizations"):
-        company = person["organizations"][0].get("name")
+    name, company = _person_name_company(person)
     name_company = slugify(f"{name}-{company}", allow_unicode=True) if (name and company) else None
+    fuzzy = fuzzy_text(name, company)
     return {
         "emails": sorted(set(emails)),
         "phones": sorted(set(phones)),
         "name_company": [name_company] if name_company else [],
+        "fuzzy": [fuzzy] if fuzzy else [],
     }
 
 
-def decide_action(candidate: Dict, existing_people: List[Dict]) -> Tuple[str, Optional[Dict], Dict]:
+def _person_name_company(person: Dict) -> Tuple[Optional[str], Optional[str]]:
+    name = None
+    if person.get("names"):
+        name = person["names"][0].get("displayName") or person["names"][0].get("givenName")
+    company = None
+    if person.get("organizations"):
+        company = person["organizations"][0].get("name")
+    return name, company
+
+
+def _schema_fuzzy_text(data: Dict) -> Optional[str]:
+    return fuzzy_text((data.get("name") or {}).get("fullName"), (data.get("organization") or {}).get("company"))
+
+
+class ContactIndex:
+    """Existing contacts indexed by match key (email, E.164 phone, name-company slug).
+
+    Built once per address book; ``decide_action`` then scores a candidate with a
+    few dictionary lookups instead of re-deriving keys for every contact. Contacts
+    keep their insertion order, which breaks score ties exactly like the old list
+    scan (earliest contact wins). ``upsert`` keeps the index current as /apply
+    creates and updates contacts. ``people`` may be person dicts or compact
+    services.contact_record.ContactRecord objects, which read the same.
+
+    With fuzzy matching on (FUZZY_MATCH, default on) names and companies are
+    also indexed by character bigrams (services.fuzzy_match), so a card whose
+    company differs from a contact's by an OCR slip or a legal suffix
+    (股份有限公司 / 股份公司), or whose name is one character off from a contact
+    sharing its phone or email, still finds it.
+    """
+
+    _KINDS = ("emails", "phones", "name_company")
+
+    def __init__(self, people: Optional[Iterable[Dict]] = None, key_cache=None, fuzzy: Optional[bool] = None) -> None:
+        # key_cache: optional services.match_key_cache.MatchKeyCache (anything with keys_for(person)).
+        self.key_cache = key_cache
+        self.fuzzy = FuzzyBlockIndex() if (fuzzy_enabled() if fuzzy is None else fuzzy) else None
+        self._people: Dict[int, Dict] = {}
+        self._keys: Dict[int, Dict[str, List[str]]] = {}
+        self._slots: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, Set[int]]] = {kind: {} for kind in self._KINDS}
+        self._next = 0
+        for person in people or []:
+            self.upsert(person)
+
+    def __len__(self) -> int:
+        return len(self._people)
+
+    def people(self) -> List[Dict]:
+        return [self._people[slot] for slot in sorted(self._people)]
+
+    def upsert(self, person: Dict, resource_name: Optional[str] = None) -> None:
+        """Insert ``person``, or replace the contact stored as ``resource_name``
+        (default: the person's own resourceName) in place."""
+        key = resource_name or person.get("resourceName")
+        slot = self._slots.pop(key, None) if key else None
+        if slot is None:
+            slot = self._next
+            self._next += 1
+        else:
+            self._unindex(slot)
+        keys = self.key_cache.keys_for(person) if self.key_cache is not None else build_keys_from_person(person)
+        self._people[slot] = person
+        self._keys[slot] = keys
+        if person.get("resourceName"):
+            self._slots[person["resourceName"]] = slot
+        for kind in self._KINDS:
+            postings = self._postings[kind]
+            for value in keys[kind]:
+                postings.setdefault(value, set()).add(slot)
+        if self.fuzzy is not None and keys.get("fuzzy"):
+            self.fuzzy.add(slot, keys["fuzzy"][0])
+
+    def _unindex(self, slot: int) -> None:
+        if self.fuzzy is not None:
+            self.fuzzy.remove(slot)
+        for kind in self._KINDS:
+            postings = self._postings[kind]
+            for value in self._keys[slot][kind]:
+                bucket = postings.get(value)
+                if bucket is not None:
+                    bucket.discard(slot)
+                    if not bucket:
+                        del postings[value]
+
+    def best_match(self, cand_keys: Dict[str, List[str]]) -> Tuple[Optional[Dict], Dict[str, List[str]], int]:
+        """(person, person keys, score) of the highest-scoring contact; score 0 if nothing shares a key."""
+        scores: Dict[int, int] = {}
+        for kind, weight in (("emails", 3), ("phones", 2), ("name_company", 1)):
+            hit: Set[int] = set()
+            postings = self._postings[kind]
+            for value in cand_keys.get(kind) or []:
+                hit |= postings.get(value, set())
+            for slot in hit:
+                scores[slot] = scores.get(slot, 0) + weight
+        if not scores:
+            return None, {}, 0
+        slot = min(scores, key=lambda s: (-scores[s], s))
+        return self._people[slot], self._keys[slot], scores[slot]
+
+    def fuzzy_match(self, text: Optional[str]) -> Tuple[Optional[Dict], Dict[str, List[str]]]:
+        """(person, person keys) of the contact with the same name and the most similar company."""
+        if self.fuzzy is None:
+            return None, {}
+        slot, _ = self.fuzzy.best(text, same_name=True)
+        if slot is None:
+            return None, {}
+        return self._people[slot], self._keys[slot]
+
+    def same_person(
+        self, cand_keys: Dict[str, List[str]], text: Optional[str], person: Dict, person_keys: Dict[str, List[str]]
+    ) -> bool:
+        """Whether fuzzy matching is on and ``person``, which already shares a phone or email
+        with the card, is the card's person despite a different name-company key (see
+        same_person_evidence)."""
+        if self.fuzzy is None:
+            return False
+        other = (person_keys.get("fuzzy") or [None])[0] or fuzzy_text(*_person_name_company(person))
+        phones = self._postings["phones"]
+        return same_person_evidence(
+            cand_keys, text, person_keys, other, self.fuzzy.min_ratio, lambda phone: len(phones.get(phone, ()))
+        )
+
+
+def same_person_evidence(
+    keys: Dict[str, List[str]],
+    text: Optional[str],
+    other_keys: Dict[str, List[str]],
+    other_text: Optional[str],
+    min_ratio: float,
+    phone_owners: Callable[[str], int],
+) -> bool:
+    """Whether two records sharing a phone or email are one person although their
+    name-company keys differ. ``text``/``other_text`` are fuzzy_text values, and
+    ``phone_owners(phone)`` is how many known records carry ``phone``.
+
+    Names and companies are compared separately so a long company cannot hide a
+    changed name. The companies must be close (services.fuzzy_match.companies_close).
+    The same name is then enough. A name one character off is accepted only when
+    the evidence is personal: a shared email, or a shared mobile number nobody else
+    has. A company switchboard on a colleague's card is not enough.
+    """
+    if not text or not other_text:
+        return False
+    name, _, company = text.partition("|")
+    other_name, _, other_company = other_text.partition("|")
+    if not companies_close(company, other_company, min_ratio):
+        return False
+    if name == other_name:
+        return True
+    if not within_one_edit(name, other_name):
+        return False
+    if set(keys.get("emails") or []) & set(other_keys.get("emails") or []):
+        return True
+    return any(
+        is_mobile_phone(phone) and phone_owners(phone) == 1
+        for phone in set(keys.get("phones") or []) & set(other_keys.get("phones") or [])
+    )
+
+
+def decide_action(candidate: Dict, existing_people: Union[ContactIndex, List[Dict]]) -> Tuple[str, Optional[Dict], Dict]:
     """
     Return (action, matched_person, updates)
     action in {create, update, skip}
+    ``existing_people`` is a ContactIndex (reuse it across a batch) or a plain list.
     """
+    index = existing_people if isinstance(existing_people, ContactIndex) else ContactIndex(existing_people)
     cand_keys = build_keys_from_schema(candidate)
-    best_match = None
-    match_score = -1
-    best_keys = None
-    for p in existing_people or []:
-        keys = build_keys_from_person(p)
-        score = 0
-        if set(cand_keys["emails"]) & set(keys["emails"]):
-            score += 3
-        if set(cand_keys["phones"]) & set(keys["phones"]):
-            score += 2
-        if set(cand_keys["name_company"]) & set(keys["name_company"]):
-            score += 1
-        if score > match_score:
-            match_score = score
-            best_match = p
-            best_keys = keys
-
-    if not best_match or match_score <= 0:
-        return ("create", None, {})
+    cand_text = _schema_fuzzy_text(candidate) if index.fuzzy is not None else None
+    best_match, best_keys, match_score = index.best_match(cand_keys)
 
-    cand_nc = set(cand_keys.get("name_company") or [])
-    matched_nc = set((best_keys or {}).get("name_company") or [])
-    if not cand_nc or not matched_nc or not (cand_nc & matched_nc):
+    if best_match and match_score > 0:
+        cand_nc = set(cand_keys.get("name_company") or [])
+        matched_nc = set((best_keys or {}).get("name_company") or [])
+        if not (cand_nc & matched_nc) and not index.same_person(cand_keys, cand_text, best_match, best_keys):
+            best_match = None
+    else:
+        best_match = None
+    if best_match is None:
+        # No contact shares a key and the name-company check: fall back to the same name at a
+        # near-identical company (股份有限公司 vs 股份公司, OCR slips in the company name).
+        best_match, _ = index.fuzzy_match(cand_text)
+    if not best_match:
         return ("create", None, {})
 
     # Compare fields to decide update vs skip
-    updates: Dict = compute_updates(candidate, best_match)
+    updates: Dict = compute_updates(keep_contact_identity(candidate, best_match), best_match)
     if updates:
         return ("update", best_match, updates)
     return ("skip", best_match, {})
 
 
+def keep_contact_identity(candidate: Dict, person: Dict) -> Dict:
+    """``candidate`` with ``person``'s name and company when the two only matched fuzzily.
+
+    A fuzzy match absorbs an OCR slip (能量叢材 for 能量叢林, 王小銘 for 王小明); the
+    card's spelling must not then be written over the contact's. Only phones,
+    emails, URLs, addresses, notes and the title still come from the card. A
+    card whose name-company key equals the contact's is returned as is.
+    """
+    cand_nc = build_keys_from_schema(candidate)["name_company"]
+    name, company = _person_name_company(person)
+    if not (name and company) or cand_nc == [slugify(f"{name}-{company}", allow_unicode=True)]:
+        return candidate
+    stored = (person.get("names") or [{}])[0]
+    return dict(
+        candidate,
+        name={
+            "fullName": name,
+            "givenName": stored.get("givenName") or "",
+            "familyName": stored.get("familyName") or "",
+        },
+        organization=dict(candidate.get("organization") or {}, company=company),
+    )
+
+
+def cluster_cards(candidates: List[Dict]) -> List[List[int]]:
+    """Group the positions of cards describing the same person, in first-seen order.
+
+    Cards are the same person under the rules decide_action applies to an
+    existing contact: the same name-company key or, with fuzzy matching on, the
+    same name at a near-identical company, or a shared email or phone plus
+    same_person_evidence. Cards without a name and company stay on their own.
+    """
+    groups: List[List[int]] = []
+    by_key: Dict[str, List[int]] = {}
+    fuzzy = FuzzyBlockIndex() if fuzzy_enabled() else None
+    # For the email/phone rule: each group's first card, and the groups carrying each value.
+    firsts: List[Tuple[Dict[str, List[str]], Optional[str]]] = []
+    by_value: Dict[str, List[int]] = {}
+    for pos, candidate in enumerate(candidates):
+        keys = build_keys_from_schema(candidate)
+        name_company = keys["name_company"]
+        text = _schema_fuzzy_text(candidate) if fuzzy is not None else None
+        slot = by_key.get(name_company[0]) if name_company else None
+        if slot is None and fuzzy is not None:
+            slot, _ = fuzzy.best(text, same_name=True)
+            if slot is None:
+                shared = sorted({g for value in keys["emails"] + keys["phones"] for g in by_value.get(value, ())})
+                slot = next(
+                    (
+                        g for g in shared
+                        if same_person_evidence(
+                            keys, text, firsts[g][0], firsts[g][1], fuzzy.min_ratio,
+                            lambda phone: len(by_value.get(phone, ())),
+                        )
+                    ),
+                    None,
+                )
+        if slot is None:
+            slot = len(groups)
+            groups.append([])
+            firsts.append((keys, text))
+            if fuzzy is not None:
+                fuzzy.add(slot, text)
+        if name_company:
+            by_key.setdefault(name_company[0], slot)
+        for value in keys["emails"] + keys["phones"]:
+            owners = by_value.setdefault(value, [])
+            if slot not in owners:
+                owners.append(slot)
+        groups[slot].append(pos)
+    return groups
+
+
+def merge_cards(cards: List[Dict]) -> Dict:
+    """One candidate from several cards of a person: the first card's name and
+    company, the first title found, and every distinct phone/email/URL/address/note."""
+    first = cards[0]
+    organization = dict(first.get("organization") or {})
+    if not organization.get("title"):
+        organization["title"] = next(
+            ((c.get("organization") or {}).get("title") for c in cards if (c.get("organization") or {}).get("title")),
+            "",
+        )
+    merged = dict(first, organization=organization)
+    for key, value_key in (("phones", "value"), ("emails", "value"), ("urls", "value"), ("addresses", "formatted")):
+        merged[key] = dedupe_values([it for c in cards for it in (c.get(key) or [])], key=value_key)
+    notes: List[str] = []
+    for c in cards:
+        note = (c.get("notes") or "").strip()
+        if note and note not in notes:
+            notes.append(note)
+    merged["notes"] = "\n".join(notes)
+    return merged
+
+
+def plan_batch(candidates: List[Dict], existing_people: Union[ContactIndex, List[Dict]]) -> List[Dict]:
+    """Deduplicate a whole batch: cluster the cards, then decide each cluster once.
+
+    Returns one entry per cluster, in first-seen order: ``members`` (positions in
+    ``candidates``, the first one is the primary card), ``data`` (the merged
+    candidate to write, with the contact's own name and company when it only
+    matched fuzzily), and ``action``/``matched``/``updates`` as from
+    decide_action. Every cluster is at most one People API write.
+
+    Two clusters can still resolve to the same contact (each close enough to it,
+    not to each other); they are folded into the earlier entry, which then
+    updates that contact once.
+    """
+    index = existing_people if isinstance(existing_people, ContactIndex) else ContactIndex(existing_people)
+    plan: List[Dict] = []
+    by_resource: Dict[str, Dict] = {}
+    for members in cluster_cards(candidates):
+        cards = [candidates[pos] for pos in members]
+        data = cards[0] if len(cards) == 1 else merge_cards(cards)
+        action, matched, updates = decide_action(data, index)
+        resource_name = matched.get("resourceName") if matched else None
+        entry = by_resource.get(resource_name) if resource_name else None
+        if entry is not None:
+            entry["members"] = sorted(entry["members"] + members)
+            merged = merge_cards([candidates[pos] for pos in entry["members"]])
+            entry["data"] = keep_contact_identity(merged, entry["matched"])
+            entry["updates"] = compute_updates(entry["data"], entry["matched"])
+            entry["action"] = "update" if entry["updates"] else "skip"
+            continue
+        if matched:
+            data = keep_contact_identity(data, matched)
+        entry = {"members": members, "data": data, "action": action, "matched": matched, "updates": updates}
+        if resource_name:
+            by_resource[resource_name] = entry
+        plan.append(entry)
+    return plan
+
+
 def compute_updates(candidate: Dict, person: Dict) -> Dict:
     updates: Dict = {}
     # Name updates
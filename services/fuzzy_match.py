@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import heapq
+import os
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+# Name + company similarity (difflib ratio, 0..1) needed to call two contacts the same person.
+MIN_RATIO = _env_float("FUZZY_MATCH_MIN_RATIO", 0.85)
+# Bigrams shared by more contacts than this (e.g. 科技, 國際) are too common to block on.
+BUCKET_CAP = _env_int("FUZZY_MATCH_BUCKET_CAP", 1000)
+# Contacts sharing the most bigrams that get the full similarity check.
+TOP_K = _env_int("FUZZY_MATCH_TOP_K", 16)
+# Companies at least this long that differ by one edit (能量叢林 / 能量叢材) count as the
+# same company for the same name even below MIN_RATIO; difflib gives a one-character
+# slip in a four-character name only 0.75.
+MIN_EDIT_LENGTH = 4
+
+# Longest first, so 股份有限公司 is removed whole rather than leaving 股份有限.
+LEGAL_SUFFIXES = (
+    "股份有限公司", "有限責任公司", "股份公司", "有限公司", "分公司", "總公司", "公司", "企業社", "商行",
+)
+LEGAL_WORDS = {
+    "co", "company", "corp", "corporation", "inc", "incorporated", "ltd", "limited", "llc", "plc", "gmbh",
+}
+_WORD_RE = re.compile(r"\w+")
+_SUFFIX_RE = re.compile(f"(?:{'|'.join(LEGAL_SUFFIXES)})+$")
+
+
+def fuzzy_enabled() -> bool:
+    return (os.getenv("FUZZY_MATCH") or "on").lower() not in {"0", "off", "false", "no"}
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case letters and digits only, full-width folded and 臺 written as 台."""
+    text = unicodedata.normalize("NFKC", name or "").lower().replace("臺", "台")
+    return "".join(_WORD_RE.findall(text)).replace("_", "")
+
+
+def normalize_company(company: str) -> str:
+    """normalize_name without legal-form words: 能量叢林股份有限公司 and 能量叢林股份公司 both give 能量叢林."""
+    text = unicodedata.normalize("NFKC", company or "").lower()
+    words = _WORD_RE.findall(text)
+    while len(words) > 1 and words[-1] in LEGAL_WORDS:
+        words.pop()
+    compact = "".join(words).replace("_", "").replace("臺", "台")
+    suffix = _SUFFIX_RE.search(compact)
+    return compact[: suffix.start()] if suffix and suffix.start() > 0 else compact
+
+
+def fuzzy_text(name: Optional[str], company: Optional[str]) -> Optional[str]:
+    """The string compared between contacts; ``None`` unless both name and company are present."""
+    n, c = normalize_name(name or ""), normalize_company(company or "")
+    return f"{n}|{c}" if (n and c) else None
+
+
+def bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+
+def similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Whether one insertion, deletion or substitution turns ``a`` into ``b`` (or they are equal)."""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1:
+        return False
+    prefix = 0
+    while prefix < len(a) and a[prefix] == b[prefix]:
+        prefix += 1
+    skip = 1 if len(a) == len(b) else 0
+    return a[prefix + skip:] == b[prefix + 1:]
+
+
+def companies_close(a: str, b: str, min_ratio: float = MIN_RATIO) -> bool:
+    """Whether two normalize_company values name the same company: ``min_ratio`` or,
+    from MIN_EDIT_LENGTH characters on, one edit apart."""
+    if a == b:
+        return True
+    if min(len(a), len(b)) >= MIN_EDIT_LENGTH and within_one_edit(a, b):
+        return True
+    return similarity(a, b) >= min_ratio
+
+
+class FuzzyBlockIndex:
+    """Character-bigram postings over fuzzy_text, for finding near-identical names.
+
+    ``best`` never compares against the whole address book: it counts shared
+    bigrams through the postings (skipping buckets larger than ``bucket_cap``),
+    keeps the ``top_k`` slots with the most overlap, and runs difflib only on
+    those, so the cost per lookup is bounded by ``bucket_cap`` and ``top_k``
+    rather than by the number of contacts.
+    """
+
+    def __init__(self, min_ratio: float = MIN_RATIO, bucket_cap: int = BUCKET_CAP, top_k: int = TOP_K) -> None:
+        self.min_ratio = min_ratio
+        self.bucket_cap = bucket_cap
+        self.top_k = top_k
+        self._texts: Dict[int, str] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    def add(self, slot: int, text: Optional[str]) -> None:
+        if not text:
+            return
+        self._texts[slot] = text
+        for gram in bigrams(text):
+            self._postings.setdefault(gram, set()).add(slot)
+
+    def remove(self, slot: int) -> None:
+        text = self._texts.pop(slot, None)
+        if text is None:
+            return
+        for gram in bigrams(text):
+            bucket = self._postings.get(gram)
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del self._postings[gram]
+
+    def candidates(self, text: str) -> List[int]:
+        """Up to ``top_k`` slots sharing the most bigrams with ``text`` (earliest slot first on ties)."""
+        grams = bigrams(text)
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            bucket = self._postings.get(gram)
+            if not bucket or len(bucket) > self.bucket_cap:
+                continue
+            for slot in bucket:
+                counts[slot] = counts.get(slot, 0) + 1
+        return heapq.nsmallest(self.top_k, counts, key=lambda s: (-counts[s], s))
+
+    def best(self, text: Optional[str], same_name: bool = False) -> Tuple[Optional[int], float]:
+        """(slot, ratio) of the most similar indexed text at or above ``min_ratio``, else (None, 0.0).
+
+        With ``same_name`` only entries with exactly the same normalized name
+        qualify and only the companies are compared: without a shared phone or
+        email, one character is all that separates 王小明 from a colleague 王大明.
+        Companies of MIN_EDIT_LENGTH or more characters also match when they are
+        one edit apart, whatever their ratio.
+        """
+        if not text:
+            return None, 0.0
+        name, _, company = text.partition("|")
+        best_slot, best_ratio = None, 0.0
+        for slot in self.candidates(text):
+            other = self._texts[slot]
+            if same_name:
+                other_name, _, other_company = other.partition("|")
+                if other_name != name:
+                    continue
+                ratio = similarity(company, other_company)
+                if ratio > best_ratio and companies_close(company, other_company, self.min_ratio):
+                    best_slot, best_ratio = slot, ratio
+                continue
+            # Length alone bounds the ratio; skip the full comparison when it cannot pass.
+            if 2 * min(len(text), len(other)) / (len(text) + len(other)) < self.min_ratio:
+                continue
+            ratio = similarity(text, other)
+            if ratio >= self.min_ratio and ratio > best_ratio:
+                best_slot, best_ratio = slot, ratio
+        return best_slot, best_ratio
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Sequence, Tuple, TypeVar
+
+from PIL import Image, ImageChops
+
+
+# 16x16 difference hash (256 bits) is the cheap first pass. It cannot tell two
+# cards of the same company template apart (names are too small to move it), so
+# a hash match is only a candidate: it is confirmed by comparing 16x16-pixel
+# blocks of a 512x384 grayscale thumbnail, where a changed name or phone number
+# shows up as one very different block while re-encoding/resizing does not.
+HASH_SIZE = 16
+THUMB_SIZE = (512, 384)
+BLOCK = 16
+DEFAULT_MAX_DISTANCE = 10
+DEFAULT_MAX_BLOCK_DIFF = 8
+
+K = TypeVar("K")
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw == "":
+        return default
+    return raw.lower() not in {"0", "off", "false", "no"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+def batch_dedupe_enabled() -> bool:
+    return _env_flag("OCR_DUP_DETECTION", True)
+
+
+def recent_dedupe_enabled() -> bool:
+    return _env_flag("OCR_RECENT_DEDUPE", False)
+
+
+class ImageFingerprint:
+    __slots__ = ("dhash", "aspect", "_thumb", "_packed")
+
+    def __init__(self, dhash: int, aspect: float, thumb: Optional[Image.Image] = None, packed: bytes = b"") -> None:
+        self.dhash = dhash
+        self.aspect = aspect
+        self._thumb = thumb
+        self._packed = packed
+
+    @property
+    def thumb(self) -> Image.Image:
+        if self._thumb is None:
+            self._thumb = Image.frombytes("L", THUMB_SIZE, zlib.decompress(self._packed))
+        return self._thumb
+
+    def packed(self) -> "ImageFingerprint":
+        """Compact copy for long-lived storage (thumbnail kept zlib-compressed)."""
+        return ImageFingerprint(self.dhash, self.aspect, packed=zlib.compress(self.thumb.tobytes(), 6))
+
+
+def fingerprint(image_path: str) -> Optional[ImageFingerprint]:
+    """dHash + confirmation thumbnail of an image file; ``None`` if it cannot be decoded."""
+    try:
+        with Image.open(image_path) as img:
+            # JPEG decoders can scale by 1/2..1/8 on the fly, which keeps this in the millisecond range.
+            img.draft("L", THUMB_SIZE)
+            aspect = img.size[0] / img.size[1]
+            gray = img.convert("L")
+            thumb = gray.resize(THUMB_SIZE, Image.BILINEAR)
+    except Exception:
+        return None
+    return ImageFingerprint(dhash(thumb), aspect, thumb)
+
+
+def dhash(img: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    small = img.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+    pixels = list(small.getdata())
+    value = 0
+    width = hash_size + 1
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def is_near_duplicate(a: ImageFingerprint, b: ImageFingerprint) -> bool:
+    if abs(a.aspect - b.aspect) > 0.02 * max(a.aspect, b.aspect):
+        return False
+    if hamming(a.dhash, b.dhash) > _env_int("OCR_DUP_MAX_DISTANCE", DEFAULT_MAX_DISTANCE):
+        return False
+    block_means = ImageChops.difference(a.thumb, b.thumb).reduce(BLOCK)
+    return max(block_means.getdata()) <= _env_int("OCR_DUP_MAX_BLOCK_DIFF", DEFAULT_MAX_BLOCK_DIFF)
+
+
+def first_near_duplicate(fp: ImageFingerprint, firsts: Sequence[Tuple[K, ImageFingerprint]]) -> Optional[K]:
+    """Key of the first of ``firsts`` that ``fp`` nearly duplicates, or None."""
+    for key, first_fp in firsts:
+        if is_near_duplicate(fp, first_fp):
+            return key
+    return None
+
+
+def group_near_duplicates(prints: List[Optional[ImageFingerprint]]) -> List[int]:
+    """For each image, the index of the first earlier image it nearly duplicates (itself if none)."""
+    reps: List[int] = []
+    firsts: List[Tuple[int, ImageFingerprint]] = []
+    for idx, fp in enumerate(prints):
+        rep = idx
+        if fp is not None:
+            found = first_near_duplicate(fp, firsts)
+            if found is None:
+                firsts.append((idx, fp))
+            else:
+                rep = found
+        reps.append(rep)
+    return reps
+
+
+class RecentHashes:
+    """Per-user memory of recently OCR'd images, so a re-upload reuses the earlier text."""
+
+    def __init__(self, per_user: int = 20, ttl_seconds: float = 24 * 3600, max_users: int = 500) -> None:
+        self.per_user = per_user
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Deque[Tuple[ImageFingerprint, str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def find(self, user_key: str, fp: ImageFingerprint) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entries = list(self._users.get(user_key) or [])
+        for stored, text, stored_at in reversed(entries):
+            if now - stored_at <= self.ttl_seconds and is_near_duplicate(fp, stored):
+                return text
+        return None
+
+    def add(self, user_key: str, fp: ImageFingerprint, text: str) -> None:
+        if not text:
+            return
+        entry = (fp.packed(), text, time.time())
+        with self._lock:
+            entries = self._users.get(user_key)
+            if entries is None:
+                entries = self._users[user_key] = deque(maxlen=self.per_user)
+            self._users.move_to_end(user_key)
+            entries.append(entry)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+
+recent_hashes = RecentHashes()
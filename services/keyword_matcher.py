@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton: finds every (possibly overlapping) keyword in one pass.
+
+    Built once from ``(keyword, label)`` pairs; ``labels(text)`` walks the text a
+    single time and returns the labels of all keywords that occur in it, so the
+    cost per line does not grow with the number of keywords.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, str]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[str]] = [frozenset()]
+        pending: List[Set[str]] = [set()]
+        for keyword, label in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    pending.append(set())
+                state = nxt
+            pending[state].add(label)
+
+        # Breadth-first: a state's fail link points to a shallower state, whose
+        # outputs are already complete when we merge them in.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                pending[nxt] |= pending[self._fail[nxt]]
+                queue.append(nxt)
+        self._out = [frozenset(labels) for labels in pending]
+        self.all_labels = frozenset().union(*self._out)
+
+    def labels(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+                if len(found) == len(self.all_labels):
+                    break
+        return found
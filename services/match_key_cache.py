@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .dedupe_service import build_keys_from_person
+from .people_service import person_etag
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = BASE_DIR / "data" / "match_keys"
+
+# Bump when build_keys_from_person (or the normalization it relies on) changes;
+# files written with another version are ignored and rebuilt.
+KEY_VERSION = 2
+
+# legal/privacy_policy.md: the file holds contact emails, phones and names, so like
+# the OCR cache it is kept no more than 24 hours after it was last written, and it
+# is deleted when the user logs out.
+MAX_TTL_SECONDS = 24 * 3600
+# How often get_key_cache sweeps the directory for other users' expired files.
+PURGE_INTERVAL_SECONDS = 300
+
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+
+def _ttl_seconds() -> int:
+    try:
+        ttl = int(os.getenv("MATCH_KEY_CACHE_TTL_SECONDS") or MAX_TTL_SECONDS)
+    except ValueError:
+        ttl = MAX_TTL_SECONDS
+    return ttl if 0 < ttl <= MAX_TTL_SECONDS else MAX_TTL_SECONDS
+
+
+class MatchKeyCache:
+    """One user's contact match keys on disk, keyed by resourceName and valid for one etag.
+
+    ``keys_for`` returns the stored keys while a contact's etag is unchanged and
+    recomputes them otherwise, so building a ContactIndex costs normalization
+    and slugging only for contacts edited since the last visit. Stored as one
+    compact JSON file: ``{"version": 2, "contacts": {resourceName: [etag,
+    emails, phones, name_company, fuzzy]}}``. A file older than ``ttl_seconds`` (capped
+    at MAX_TTL_SECONDS) is deleted instead of read.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: int = MAX_TTL_SECONDS) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds if 0 < ttl_seconds <= MAX_TTL_SECONDS else MAX_TTL_SECONDS
+        self._entries: Optional[Dict[str, list]] = None
+        self._seen: Set[str] = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> Dict[str, list]:
+        if self._entries is None:
+            entries: Dict[str, list] = {}
+            try:
+                if time.time() - self.path.stat().st_mtime > self.ttl_seconds:
+                    self.path.unlink(missing_ok=True)
+                    raise FileNotFoundError(self.path)
+                data = json.loads(self.path.read_text("utf-8"))
+                if data.get("version") == KEY_VERSION:
+                    entries = data.get("contacts") or {}
+            except (OSError, ValueError, AttributeError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    def keys_for(self, person: Dict) -> Dict[str, List[str]]:
+        resource_name = person.get("resourceName")
+        etag = person_etag(person)
+        if not resource_name or not etag:
+            return build_keys_from_person(person)
+        with self._lock:
+            entries = self._load()
+            self._seen.add(resource_name)
+            entry = entries.get(resource_name)
+            if entry and entry[0] == etag:
+                self.hits += 1
+                return {
+                    "emails": entry[1],
+                    "phones": entry[2],
+                    "name_company": [entry[3]] if entry[3] else [],
+                    "fuzzy": [entry[4]] if entry[4] else [],
+                }
+        keys = build_keys_from_person(person)
+        with self._lock:
+            self.misses += 1
+            entries[resource_name] = [
+                etag, keys["emails"], keys["phones"], (keys["name_company"] or [""])[0], (keys["fuzzy"] or [""])[0],
+            ]
+            self._dirty = True
+        return keys
+
+    def save(self) -> None:
+        """Write changes, dropping contacts not looked up since load (deleted from the address book)."""
+        with self._lock:
+            entries = self._load()
+            stale = [name for name in entries if name not in self._seen]
+            if not self._dirty and not stale:
+                return
+            for name in stale:
+                del entries[name]
+            data = json.dumps({"version": KEY_VERSION, "contacts": entries}, ensure_ascii=False, separators=(",", ":"))
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(data, "utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._load())}
+
+
+def _cache_path(user_key: str) -> Path:
+    directory = Path(os.getenv("MATCH_KEY_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    digest = hashlib.sha256(user_key.encode("utf-8")).hexdigest()[:32]
+    return directory / f"{digest}.json"
+
+
+def purge_expired(directory: Path, ttl_seconds: int = MAX_TTL_SECONDS) -> int:
+    """Delete cache files older than ``ttl_seconds``; returns how many were removed."""
+    removed = 0
+    now = time.time()
+    try:
+        files = list(Path(directory).glob("*.json"))
+    except OSError:
+        return 0
+    for path in files:
+        try:
+            if now - path.stat().st_mtime > ttl_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def get_key_cache(user_key: Optional[str]) -> Optional[MatchKeyCache]:
+    """Cache file for ``user_key``; ``None`` without a user or when MATCH_KEY_CACHE=off."""
+    global _last_purge
+    if not user_key or (os.getenv("MATCH_KEY_CACHE") or "on").lower() in {"0", "off", "false", "no"}:
+        return None
+    path = _cache_path(user_key)
+    ttl = _ttl_seconds()
+    now = time.time()
+    with _purge_lock:
+        due = now - _last_purge >= PURGE_INTERVAL_SECONDS
+        if due:
+            _last_purge = now
+    if due:
+        purge_expired(path.parent, ttl)
+    return MatchKeyCache(path, ttl)
+
+
+def delete_key_cache(user_key: Optional[str]) -> None:
+    """Remove ``user_key``'s cached contact keys (on logout)."""
+    if user_key:
+        _cache_path(user_key).unlink(missing_ok=True)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = BASE_DIR / "data" / "ocr_cache"
+
+DEFAULT_MEMORY_ITEMS = 256
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+# legal/privacy_policy.md: card images and OCR text are kept no more than 24 hours.
+MAX_TTL_SECONDS = 24 * 3600
+DEFAULT_TTL_SECONDS = MAX_TTL_SECONDS
+# How often get/put sweep the directory for expired entries.
+PURGE_INTERVAL_SECONDS = 300
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def cache_key(image_path: str, engine: str) -> Optional[str]:
+    """SHA-256 over the OCR engine/config id and the image bytes (``None`` if unreadable)."""
+    digest = hashlib.sha256(engine.encode("utf-8") + b"\0")
+    try:
+        with open(image_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """Two-tier OCR result cache: in-memory LRU in front of a size/TTL-bounded directory.
+
+    The TTL is capped at MAX_TTL_SECONDS (0 or larger values mean the cap), and
+    expired files are swept on reads and writes, so no OCR text outlives the
+    retention the privacy policy promises.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        memory_items: int = DEFAULT_MEMORY_ITEMS,
+        disk_bytes: int = DEFAULT_DISK_BYTES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.directory = Path(directory)
+        self.memory_items = max(0, memory_items)
+        self.disk_bytes = max(0, disk_bytes)
+        self.ttl_seconds = ttl_seconds if 0 < ttl_seconds <= MAX_TTL_SECONDS else MAX_TTL_SECONDS
+        self._last_purge = 0.0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_usage: Optional[int] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.txt"
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at > self.ttl_seconds
+
+    def _maybe_purge(self, now: float) -> None:
+        with self._lock:
+            due = self.disk_bytes and now - self._last_purge >= PURGE_INTERVAL_SECONDS
+            if due:
+                self._last_purge = now
+        if due:
+            self.evict()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        self._maybe_purge(now)
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                text, stored_at = item
+                if not self._expired(stored_at, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return text
+                del self._memory[key]
+
+        text = None
+        if self.disk_bytes:
+            path = self._path(key)
+            try:
+                stored_at = path.stat().st_mtime
+                if self._expired(stored_at, now):
+                    path.unlink(missing_ok=True)
+                else:
+                    text = path.read_text("utf-8")
+            except OSError:
+                text = None
+
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, text, stored_at)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        if not text:
+            return
+        now = time.time()
+        self._maybe_purge(now)
+        with self._lock:
+            self._remember(key, text, now)
+        if not self.disk_bytes:
+            return
+        data = text.encode("utf-8")
+        if len(data) > self.disk_bytes:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_usage is not None:
+                self._disk_usage += len(data)
+            over_budget = self._disk_usage is None or self._disk_usage > self.disk_bytes
+        if over_budget:
+            self.evict()
+
+    def _remember(self, key: str, text: str, stored_at: float) -> None:
+        if not self.memory_items:
+            return
+        self._memory[key] = (text, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def evict(self) -> None:
+        """Drop expired entries, then the oldest ones until the directory fits the byte budget."""
+        now = time.time()
+        entries = []
+        try:
+            for path in self.directory.glob("*.txt"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        except OSError:
+            return
+        entries.sort()
+        total = 0
+        kept = []
+        for mtime, size, path in entries:
+            if self._expired(mtime, now):
+                path.unlink(missing_ok=True)
+            else:
+                kept.append((size, path))
+                total += size
+        for size, path in kept:
+            if total <= self.disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        with self._lock:
+            self._disk_usage = total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._disk_usage = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+        for path in self.directory.glob("*.txt"):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (hits / lookups) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_usage,
+            }
+
+
+_default_cache: Optional[OcrCache] = None
+_default_lock = threading.Lock()
+
+
+def get_cache() -> Optional[OcrCache]:
+    """Process-wide cache configured from the environment; ``None`` when OCR_CACHE=off."""
+    global _default_cache
+    if (os.getenv("OCR_CACHE") or "on").lower() in {"0", "off", "false", "no"}:
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = OcrCache(
+                    Path(os.getenv("OCR_CACHE_DIR") or DEFAULT_CACHE_DIR),
+                    memory_items=_env_int("OCR_CACHE_MEMORY_ITEMS", DEFAULT_MEMORY_ITEMS),
+                    disk_bytes=_env_int("OCR_CACHE_DISK_BYTES", DEFAULT_DISK_BYTES),
+                    ttl_seconds=_env_int("OCR_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                )
+    return _default_cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    cache = get_cache()
+    return cache.stats() if cache else {}
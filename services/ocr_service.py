@@ -2,11 +2,122 @@ from __future__ import annotations
 
 import base64
 import io
+import itertools
 import os
-from typing import Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
 
-import requests
-from PIL import Image
+from PIL import Image, ImageOps, features
+
+from . import circuit_breaker, ocr_cache, tesseract_pool, vision_client
+
+
+# images:annotate accepts at most 16 images per call; keep the JSON body under the request size limit.
+VISION_MAX_IMAGES_PER_REQUEST = 16
+VISION_MAX_REQUEST_BYTES = 10 * 1024 * 1024
+_VISION_ENTRY_OVERHEAD = 128  # JSON framing per image entry
+
+# Text detection does not need full phone-camera resolution.
+DEFAULT_MAX_EDGE = 2048
+DEFAULT_JPEG_QUALITY = 85
+
+# Vision API error codes in per-image responses that mean the backend (not the image) is at fault.
+_VISION_BACKEND_ERROR_CODES = {4, 8, 13, 14}  # DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, INTERNAL, UNAVAILABLE
+
+_executor: Optional[ThreadPoolExecutor] = None
+_batch_executor: Optional[ThreadPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_executor_lock = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+# When Vision is down or out of quota, skip straight to the fallback instead of
+# waiting for every card's request to fail.
+_vision_breaker = circuit_breaker.CircuitBreaker(
+    "vision",
+    failure_rate=_env_float("VISION_BREAKER_FAILURE_RATE", 0.5),
+    slow_call_seconds=_env_float("VISION_BREAKER_SLOW_SECONDS", 10.0),
+    cooldown_seconds=_env_float("VISION_BREAKER_COOLDOWN", 30.0),
+)
+
+
+def vision_status() -> Dict:
+    """Circuit breaker state for the Vision backend (for health checks and logs)."""
+    return _vision_breaker.status()
+
+
+def _max_workers() -> int:
+    try:
+        return max(1, int(os.getenv("OCR_MAX_WORKERS") or 4))
+    except ValueError:
+        return 4
+
+
+def _max_request_bytes() -> int:
+    try:
+        return max(1, int(os.getenv("VISION_MAX_REQUEST_BYTES") or VISION_MAX_REQUEST_BYTES))
+    except ValueError:
+        return VISION_MAX_REQUEST_BYTES
+
+
+def _preprocess_config() -> Optional[Tuple[int, bool, str, int]]:
+    """(max_edge, grayscale, format, quality) from the environment; ``None`` when disabled."""
+    if (os.getenv("OCR_PREPROCESS") or "on").lower() in {"0", "off", "false", "no"}:
+        return None
+    try:
+        max_edge = max(64, int(os.getenv("OCR_MAX_EDGE") or DEFAULT_MAX_EDGE))
+    except ValueError:
+        max_edge = DEFAULT_MAX_EDGE
+    try:
+        quality = min(95, max(30, int(os.getenv("OCR_JPEG_QUALITY") or DEFAULT_JPEG_QUALITY)))
+    except ValueError:
+        quality = DEFAULT_JPEG_QUALITY
+    grayscale = (os.getenv("OCR_GRAYSCALE") or "on").lower() not in {"0", "off", "false", "no"}
+    fmt = (os.getenv("OCR_IMAGE_FORMAT") or "jpeg").lower()
+    if fmt not in {"jpeg", "webp"} or (fmt == "webp" and not features.check("webp")):
+        fmt = "jpeg"
+    return max_edge, grayscale, fmt, quality
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared pool for OCR work (preprocessing, annotate calls, fallback), for all users together."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=_max_workers(), thread_name_prefix="ocr")
+    return _executor
+
+
+def _ocr_slots() -> threading.BoundedSemaphore:
+    """``OCR_MAX_WORKERS`` slots held for each Vision call or fallback recognition, wherever it
+    runs (pool thread or the caller's own), so OCR concurrency is bounded across all users."""
+    global _slots
+    if _slots is None:
+        with _executor_lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(_max_workers())
+    return _slots
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    # Runs whole extract_text_many batches for submit_text_many. Kept apart from _get_executor:
+    # a batch waits on OCR jobs, and waiting inside the pool that runs them could deadlock it.
+    global _batch_executor
+    if _batch_executor is None:
+        with _executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(max_workers=_max_workers(), thread_name_prefix="ocr-batch")
+    return _batch_executor
 
 
 def _read_image_bytes(path: str) -> bytes:
@@ -14,46 +125,244 @@ def _read_image_bytes(path: str) -> bytes:
         return f.read()
 
 
+def prepare_image_bytes(image_path: str) -> bytes:
+    """Bytes to send to Vision: long edge capped, optionally grayscale, re-encoded.
+
+    Falls back to the original file when it is not a decodable image or when
+    re-encoding would not make it smaller.
+    """
+    raw = _read_image_bytes(image_path)
+    config = _preprocess_config()
+    if config is None:
+        return raw
+    max_edge, grayscale, fmt, quality = config
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            resized = max(img.size) > max_edge
+            if resized and img.format == "JPEG":
+                # Let the JPEG decoder scale down (1/2, 1/4, 1/8) instead of decoding full size.
+                img.draft("L" if grayscale else "RGB", (max_edge, max_edge))
+            img = ImageOps.exif_transpose(img)
+            if resized:
+                try:
+                    resample = Image.Resampling.LANCZOS  # Pillow >=9.1
+                except AttributeError:
+                    resample = Image.LANCZOS
+                img.thumbnail((max_edge, max_edge), resample)
+            img = img.convert("L" if grayscale else "RGB")
+            buffer = io.BytesIO()
+            img.save(buffer, format=fmt.upper(), quality=quality)
+            out = buffer.getvalue()
+    except Exception:
+        return raw
+    return out if resized or len(out) < len(raw) else raw
+
+
 def extract_text(image_path: str) -> str:
+    return extract_text_many([image_path])[0]
+
+
+def submit_text_many(image_paths: List[str]) -> "Future[List[str]]":
+    """extract_text_many in the background, for callers that keep producing images meanwhile."""
+    return _get_batch_executor().submit(extract_text_many, image_paths)
+
+
+def extract_text_many(image_paths: List[str]) -> List[str]:
+    """OCR a batch of images; results keep the input order.
+
+    Images already seen (same bytes, same engine config) are served from the OCR
+    cache. With Vision configured the rest are preprocessed in parallel and packed
+    into as few ``images:annotate`` calls as possible; cards Vision could not read
+    go through the fallback concurrently. Blocking call: run it off the event loop
+    (e.g. ``run_in_threadpool``). At most ``OCR_MAX_WORKERS`` Vision calls or
+    fallback recognitions run at once across all batches and users.
+    """
+    if not image_paths:
+        return []
     api_key = os.getenv("VISION_API_KEY")
+    results: List[Optional[str]] = [None] * len(image_paths)
+    keys: List[Optional[str]] = [None] * len(image_paths)
+
+    cache = ocr_cache.get_cache()
+    if cache is not None:
+        engine = _engine_id(api_key)
+        for idx, path in enumerate(image_paths):
+            keys[idx] = ocr_cache.cache_key(path, engine)
+            if keys[idx]:
+                results[idx] = cache.get(keys[idx])
+
+    pending = [idx for idx, txt in enumerate(results) if txt is None]
+    if api_key and pending:
+        texts = _extract_many_with_vision([image_paths[idx] for idx in pending], api_key)
+        for idx, txt in zip(pending, texts):
+            results[idx] = txt
+            if txt and cache is not None and keys[idx]:
+                cache.put(keys[idx], txt)
+
+    missing = [idx for idx in pending if not results[idx]]
+    if len(missing) == 1:
+        fallback_texts = [_fallback_job(image_paths[missing[0]])]
+    elif missing:
+        executor = _get_executor()
+        fallback_texts = list(executor.map(_fallback_job, [image_paths[idx] for idx in missing]))
+    else:
+        fallback_texts = []
+    for idx, txt in zip(missing, fallback_texts):
+        results[idx] = txt
+        # Only cache what the configured primary engine produced; a Tesseract result
+        # after a Vision hiccup should not pin a weaker answer.
+        if txt and not api_key and cache is not None and keys[idx]:
+            cache.put(keys[idx], txt)
+    return [txt or "" for txt in results]
+
+
+def _engine_id(api_key: Optional[str]) -> str:
+    """Identifies the OCR engine/config that produced a result, for cache keys."""
     if api_key:
-        txt = _extract_with_vision(image_path, api_key)
-        if txt:
-            return txt
+        config = _preprocess_config()
+        prep = "raw" if config is None else "{}-{}-{}-q{}".format(config[0], "gray" if config[1] else "rgb", config[2], config[3])
+        return f"vision:TEXT_DETECTION:{prep}"
+    fallback = (os.getenv("OCR_FALLBACK") or "tesseract").lower()
+    if fallback == "tesseract":
+        return f"fallback:tesseract:{tesseract_pool.configured_lang()}"
+    return f"fallback:{fallback}"
+
+
+def _fallback_job(image_path: str) -> str:
+    with _ocr_slots():
+        return _extract_with_fallback(image_path)
+
+
+def _extract_with_fallback(image_path: str) -> str:
     fallback = (os.getenv("OCR_FALLBACK") or "tesseract").lower()
     if fallback == "tesseract":
         try:
-            import pytesseract
-        except Exception:
-            return ""
-        try:
-            img = Image.open(image_path)
-            return pytesseract.image_to_string(img)
+            return tesseract_pool.get_pool().recognize(image_path)
         except Exception:
             return ""
     return ""
 
 
-def _extract_with_vision(image_path: str, api_key: str) -> Optional[str]:
-    try:
-        img_b64 = base64.b64encode(_read_image_bytes(image_path)).decode("utf-8")
-        url = f"https://vision.googleapis.com/v1/images:annotate?key={api_key}"
-        payload = {
-            "requests": [
-                {
-                    "image": {"content": img_b64},
-                    "features": [{"type": "TEXT_DETECTION"}],
-                }
-            ]
-        }
-        resp = requests.post(url, json=payload, timeout=30)
-        if resp.status_code != 200:
-            return None
-        data = resp.json()
-        ann = (data.get("responses") or [{}])[0].get("fullTextAnnotation")
-        if ann and ann.get("text"):
-            return ann["text"]
-    except Exception:
+def _encode_image(path: str) -> Optional[str]:
+    try:
+        return base64.b64encode(prepare_image_bytes(path)).decode("utf-8")
+    except OSError:
         return None
-    return None
 
+
+def _prefetch(fn, items: List[str], ahead: int) -> Iterator:
+    """``fn(item)`` for each item, in order, computed on the shared pool up to ``ahead`` items early.
+
+    Preprocessing a 4000px photo takes ~0.2 s, so a batch's cards are decoded and
+    re-encoded in parallel while only a few payloads sit in memory at once.
+    """
+    if len(items) <= 1:
+        yield from (fn(item) for item in items)
+        return
+    executor = _get_executor()
+    queue: Deque[Future] = deque()
+    for item in items:
+        if len(queue) >= ahead:
+            yield queue.popleft().result()
+        queue.append(executor.submit(fn, item))
+    while queue:
+        yield queue.popleft().result()
+
+
+def _vision_batches(image_paths: List[str]) -> Iterator[Tuple[List[int], List[Dict]]]:
+    """Lazily pack images into annotate requests, split on image count and payload size.
+
+    Yields ``(indices, requests)`` where ``indices`` maps each request entry back to
+    its position in ``image_paths``. Unreadable files are left out (they stay ``None``).
+    """
+    limit = _max_request_bytes()
+    indices: List[int] = []
+    entries: List[Dict] = []
+    size = 0
+    for idx, img_b64 in enumerate(_prefetch(_encode_image, image_paths, _max_workers())):
+        if img_b64 is None:
+            continue
+        entry_size = len(img_b64) + _VISION_ENTRY_OVERHEAD
+        if entries and (len(entries) >= VISION_MAX_IMAGES_PER_REQUEST or size + entry_size > limit):
+            yield indices, entries
+            indices, entries, size = [], [], 0
+        indices.append(idx)
+        entries.append({
+            "image": {"content": img_b64},
+            "features": [{"type": "TEXT_DETECTION"}],
+        })
+        size += entry_size
+    if entries:
+        yield indices, entries
+
+
+def _annotate(entries: List[Dict], api_key: str) -> List[Optional[str]]:
+    """Send one images:annotate call; return the text per entry (``None`` on error)."""
+    texts: List[Optional[str]] = [None] * len(entries)
+    if not _vision_breaker.allow():
+        return texts
+    start = time.monotonic()
+    try:
+        with _ocr_slots():
+            responses = vision_client.get_client().annotate(entries, api_key)
+    except vision_client.VisionError as exc:
+        # 400-style errors are about the request, not Vision's health.
+        if exc.status_code is None or exc.status_code >= 500 or exc.status_code in {401, 403, 429}:
+            _vision_breaker.record_failure(time.monotonic() - start)
+        else:
+            _vision_breaker.record_success(time.monotonic() - start)
+        return texts
+    except Exception:
+        _vision_breaker.record_failure(time.monotonic() - start)
+        return texts
+    backend_errors = 0
+    for pos, res in enumerate(responses[: len(entries)]):
+        res = res or {}
+        if (res.get("error") or {}).get("code") in _VISION_BACKEND_ERROR_CODES:
+            backend_errors += 1
+        ann = res.get("fullTextAnnotation")
+        if ann and ann.get("text"):
+            texts[pos] = ann["text"]
+    if entries and backend_errors == len(entries):
+        _vision_breaker.record_failure(time.monotonic() - start)
+    else:
+        _vision_breaker.record_success(time.monotonic() - start)
+    return texts
+
+
+def _extract_many_with_vision(image_paths: List[str], api_key: str) -> List[Optional[str]]:
+    results: List[Optional[str]] = [None] * len(image_paths)
+    if _vision_breaker.state == circuit_breaker.OPEN:
+        return results
+    batches = _vision_batches(image_paths)
+    first = next(batches, None)
+    if first is None:
+        return results
+    second = next(batches, None)
+    if second is None:
+        # Common case (one upload batch): a single call, no pool hop.
+        indices, entries = first
+        for idx, txt in zip(indices, _annotate(entries, api_key)):
+            results[idx] = txt
+        return results
+
+    # Several calls: send them concurrently, but keep only a few encoded
+    # payloads in memory at once.
+    executor = _get_executor()
+    max_in_flight = _max_workers()
+    pending: Dict[Future, List[int]] = {}
+
+    def _collect(done: Set[Future]) -> None:
+        for fut in done:
+            for idx, txt in zip(pending.pop(fut), fut.result()):
+                results[idx] = txt
+
+    for indices, entries in itertools.chain((first, second), batches):
+        if len(pending) >= max_in_flight:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            _collect(done)
+        pending[executor.submit(_annotate, entries, api_key)] = indices
+    if pending:
+        done, _ = wait(pending)
+        _collect(done)
+    return results
@@ -1,25 +1,183 @@
 from __future__ import annotations
 
+import json
+import os
 import re
-from typing import Dict, List, Optional, Tuple
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+from .keyword_matcher import KeywordMatcher
 from .phone_email_utils import normalize_phone, validate_email, dedupe_values
+from .tw_address import address_score, best_address_index
 
 
-# Simple heuristics and regex for business card parsing
-EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+# Simple heuristics and regex for business card parsing.
+# Every pattern runs in time linear in the input (OCR text can be arbitrary
+# garbage): quantifiers that could fail after a long run are bounded, and an
+# email can only start at the beginning of a run of local-part characters, so a
+# long run without "@" is scanned once instead of once per position. Addresses
+# beyond the RFC limits (64-char local part, 253-char domain) were never valid.
+# URL_RE cannot fail once "http(s)://" and one host character matched, so it
+# needs no bound; PHONE_RE is bounded throughout.
+EMAIL_RE = re.compile(r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,63}")
 PHONE_RE = re.compile(r"(?:\+\d{1,3}[\s-]?)?(?:\(?\d{2,4}\)?[\s-]?)?\d{3,4}[\s-]?\d{3,4}")
 URL_RE = re.compile(r"https?://[\w.-]+(?:/[\w\-./?%&=]*)?")
+# One left-to-right scan for all three. At each position email and URL are tried
+# before phone, so digits inside an address or link are never phone candidates.
+# The lookahead lets the phone branch fail fast on the (many) positions that
+# cannot start a number.
+ENTITY_RE = re.compile(
+    f"(?P<email>{EMAIL_RE.pattern})|(?P<url>{URL_RE.pattern})|(?P<phone>(?=[+(\\d]){PHONE_RE.pattern})"
+)
+# Everything str.splitlines() breaks on; kept when entities are cut out of a card
+# so the remaining text still lines up with the card's lines.
+LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]")
 
-COMPANY_HINTS = ["有限公司", "股份有限公司", "Inc", "LLC", "Co.", "Company", "股份", "科技", "資訊", "International", "Corp", "Corporation"]
-TITLE_HINTS = [
-    "執行長", "營運長", "技術長", "行銷長", "財務長", "董事長", "總經理", "副總", "經理", "副理", "主任",
-    "Director", "VP", "CEO", "CTO", "COO", "CFO", "Manager", "Lead", "Head"
-]
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name) or default))
+    except ValueError:
+        return default
 
-def parse_text_to_schema(text: str) -> Dict:
-    lines = [l.strip() for l in (text or "").splitlines() if l.strip()]
+
+# Input budget per card. A real card is a few hundred characters and well under
+# 50 lines; anything past the budget (barcodes, a whole document fed through OCR)
+# is dropped before parsing so one bad scan cannot stall a batch.
+MAX_TEXT_CHARS = _env_int("PARSE_MAX_CHARS", 20000)
+MAX_TEXT_LINES = _env_int("PARSE_MAX_LINES", 200)
+
+
+def clip_text(text: str) -> str:
+    """Truncate OCR text to the parse budget (MAX_TEXT_CHARS, then MAX_TEXT_LINES)."""
+    if len(text) > MAX_TEXT_CHARS:
+        text = text[:MAX_TEXT_CHARS]
+    lines = text.splitlines()
+    if len(lines) > MAX_TEXT_LINES:
+        text = "\n".join(lines[:MAX_TEXT_LINES])
+    return text
+
+HINTS_PATH = Path(__file__).resolve().parent / "data" / "parse_hints.json"
+
+
+def load_hints(*paths: Optional[str]) -> Dict[str, List[str]]:
+    """Merge ``{"company": [...], "title": [...]}`` hint files, keeping first-seen order."""
+    merged: Dict[str, List[str]] = {"company": [], "title": []}
+    for path in paths:
+        if not path:
+            continue
+        data = json.loads(Path(path).read_text("utf-8"))
+        for label, values in data.items():
+            bucket = merged.setdefault(label, [])
+            bucket.extend(v for v in values if v and v not in bucket)
+    return merged
+
+
+def build_hint_matcher(hints: Dict[str, List[str]]) -> KeywordMatcher:
+    return KeywordMatcher((hint, label) for label, values in hints.items() for hint in values)
+
+
+# Extra markets/industries can be added with PARSE_HINTS_FILE (same JSON shape) without code changes.
+HINTS = load_hints(str(HINTS_PATH), os.getenv("PARSE_HINTS_FILE"))
+COMPANY_HINTS = HINTS["company"]
+TITLE_HINTS = HINTS["title"]
+_HINT_MATCHER = build_hint_matcher(HINTS)
+
+
+class _ParseState:
+    """Normalization results shared by every card parsed in one batch.
+
+    The same phone numbers and emails (company switchboard, shared domains, the
+    same card scanned twice) recur across a batch, so each distinct raw match is
+    validated once.
+    """
+
+    __slots__ = ("phones", "emails")
+
+    def __init__(self) -> None:
+        self.phones: Dict[str, Optional[str]] = {}
+        self.emails: Dict[str, Optional[str]] = {}
+
+    def phone(self, raw: str) -> Optional[str]:
+        try:
+            return self.phones[raw]
+        except KeyError:
+            value = self.phones[raw] = normalize_phone(raw)
+            return value
+
+    def email(self, raw: str) -> Optional[str]:
+        try:
+            return self.emails[raw]
+        except KeyError:
+            value = self.emails[raw] = validate_email(raw)
+            return value
+
+
+# Optional per-stage timing: ``hook(stage, seconds)`` is called after each stage of
+# a card (see services/parse_timing.StageTimings). Without a hook the only cost is
+# one ``if`` per stage.
+StageHook = Callable[[str, float], None]
+
+
+def parse_text_to_schema(text: str, hook: Optional[StageHook] = None) -> Dict:
+    return _parse(text, _ParseState(), hook)
+
+
+def parse_many(
+    texts: Iterable[str],
+    processes: Optional[int] = None,
+    chunk_size: int = 500,
+    hook: Optional[StageHook] = None,
+) -> List[Dict]:
+    """Parse a batch of OCR texts; results keep the input order.
+
+    Cards share normalization state. For bulk imports, ``processes`` > 1 (or 0
+    for one per CPU; default ``PARSE_PROCESSES``, else 1) fans chunks of
+    ``chunk_size`` cards out to a process pool. Stage timings measured in worker
+    processes are replayed into ``hook`` here.
+    """
+    texts = list(texts)
+    if processes is None:
+        try:
+            processes = int(os.getenv("PARSE_PROCESSES") or 1)
+        except ValueError:
+            processes = 1
+    if processes == 0:
+        processes = os.cpu_count() or 1
+    chunk_size = max(1, chunk_size)
+    if processes <= 1 or len(texts) <= chunk_size:
+        state = _ParseState()
+        return [_parse(text, state, hook) for text in texts]
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    results: List[Dict] = []
+    with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as pool:
+        for part, timings in pool.map(_parse_chunk, chunks, [hook is not None] * len(chunks)):
+            results.extend(part)
+            for stage, seconds in timings:
+                hook(stage, seconds)
+    return results
+
+
+def _parse_chunk(texts: List[str], timed: bool = False) -> Tuple[List[Dict], List[Tuple[str, float]]]:
+    state = _ParseState()
+    timings: List[Tuple[str, float]] = []
+    hook = (lambda stage, seconds: timings.append((stage, seconds))) if timed else None
+    return [_parse(text, state, hook) for text in texts], timings
+
+
+def _lap(hook: StageHook, stage: str, started: float) -> float:
+    now = time.perf_counter()
+    hook(stage, now - started)
+    return now
+
+
+def _parse(text: str, state: _ParseState, hook: Optional[StageHook] = None) -> Dict:
+    started = time.perf_counter() if hook else 0.0
+    text = clip_text(text or "")
+    raw_lines = text.splitlines()
+    lines = [l.strip() for l in raw_lines if l.strip()]
 
     emails = []
     phones = []
@@ -27,28 +185,48 @@ def parse_text_to_schema(text: str) -> Dict:
     addresses = []
 
     # Collect via regex
-    for m in EMAIL_RE.finditer(text or ""):
-        e = validate_email(m.group(0))
+    raw_emails = []
+    raw_phones = []
+    spans = []
+    for m in ENTITY_RE.finditer(text):
+        spans.append(m.span())
+        kind = m.lastgroup
+        if kind == "phone":
+            raw_phones.append(m.group(0))
+        elif kind == "email":
+            raw_emails.append(m.group(0))
+        else:
+            urls.append({"type": "work", "value": m.group(0)})
+    if hook:
+        started = _lap(hook, "regex", started)
+
+    for raw in raw_emails:
+        e = state.email(raw)
         if e:
             emails.append({"type": "work", "value": e})
+    if hook:
+        started = _lap(hook, "emails", started)
 
-    for m in PHONE_RE.finditer(text or ""):
-        p = normalize_phone(m.group(0))
+    for raw in raw_phones:
+        p = state.phone(raw)
         if p:
             phones.append({"type": "mobile", "value": p})
-
-    for m in URL_RE.finditer(text or ""):
-        urls.append({"type": "work", "value": m.group(0)})
+    if hook:
+        started = _lap(hook, "phones", started)
 
     # Guess name/company/title from first few lines
     name_parts = guess_name(lines)
+    if hook:
+        started = _lap(hook, "name", started)
     company, title = guess_company_title(lines)
+    if hook:
+        started = _lap(hook, "company_title", started)
 
-    # Try to guess address: last long line with CJK or numbers and punctuation
-    for ln in reversed(lines):
-        if len(ln) > 10 and any(ch.isdigit() for ch in ln):
-            addresses.append({"type": "work", "formatted": ln})
-            break
+    address = guess_address(lines, _lines_without_spans(text, raw_lines, spans))
+    if address:
+        addresses.append({"type": "work", "formatted": address})
+    if hook:
+        _lap(hook, "address", started)
 
     data = {
         "name": {
@@ -69,6 +247,45 @@ def parse_text_to_schema(text: str) -> Dict:
     return data
 
 
+def _lines_without_spans(text: str, raw_lines: List[str], spans: List[Tuple[int, int]]) -> List[str]:
+    """The non-empty lines of ``text`` with the ``spans`` already found by ENTITY_RE cut out."""
+    if not spans:
+        return [ln for ln in raw_lines if ln.strip()]
+    parts = []
+    pos = 0
+    for start, end in spans:
+        parts.append(text[pos:start])
+        # A phone number may run across a line break; keep the break.
+        parts.extend(LINE_BREAK_RE.findall(text, start, end))
+        pos = end
+    parts.append(text[pos:])
+    rest = "".join(parts).splitlines()
+    rest.extend([""] * (len(raw_lines) - len(rest)))
+    return [r for ln, r in zip(raw_lines, rest) if ln.strip()]
+
+
+def guess_address(lines: List[str], stripped: Optional[List[str]] = None) -> Optional[str]:
+    # Lines are scored without their phones, emails and URLs, so a phone or
+    # tax-ID line has no digits left and a merged "address + URL" line still counts.
+    # ``stripped`` lets _parse pass those lines in from its single ENTITY_RE scan.
+    if stripped is None:
+        stripped = [ENTITY_RE.sub("", ln) for ln in lines]
+    idx = best_address_index(stripped)
+    if idx is not None:
+        return lines[idx]
+    # No gazetteer match (e.g. a foreign address): last long line with words and
+    # digits and no phone/fax/tax-ID marker.
+    for ln, rest in zip(reversed(lines), reversed(stripped)):
+        if (
+            len(ln) > 10
+            and any(ch.isdigit() for ch in rest)
+            and any(ch.isalpha() for ch in rest)
+            and address_score(rest) > 0
+        ):
+            return ln
+    return None
+
+
 def guess_name(lines: List[str]) -> Tuple[str, str, str]:
     # Return (full, given, family)
     if not lines:
@@ -107,9 +324,10 @@ def guess_company_title(lines: List[str]) -> Tuple[Optional[str], Optional[str]]
     company = None
     title = None
     for ln in lines[:8]:
-        if any(h in ln for h in TITLE_HINTS) and not title:
+        hits = _HINT_MATCHER.labels(ln)
+        if "title" in hits and not title:
             title = ln
-        if any(h in ln for h in COMPANY_HINTS) and not company:
+        if "company" in hits and not company:
             company = ln
         if company and title:
             break
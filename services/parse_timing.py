@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import csv
+import math
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+STAGES = ("regex", "emails", "phones", "name", "company_title", "address")
+
+
+def timings_enabled() -> bool:
+    return (os.getenv("PARSE_TIMINGS") or "").lower() in {"1", "on", "true", "yes"}
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class StageTimings:
+    """Collects per-stage parse timings; pass the instance as ``hook`` to parse_service."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+        # Uploads finishing in the same second each get their own file.
+        self.session_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.csv_path: Optional[str] = None
+
+    def __call__(self, stage: str, seconds: float) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> List[Dict]:
+        """One row per stage (pipeline order first): count, total, mean and p50/p95/p99 in ms."""
+        order = [s for s in STAGES if s in self.samples] + sorted(set(self.samples) - set(STAGES))
+        rows = []
+        for stage in order:
+            values = sorted(self.samples[stage])
+            total = sum(values)
+            rows.append({
+                "stage": stage,
+                "count": len(values),
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total * 1000 / len(values), 4),
+                "p50_ms": round(_percentile(values, 50) * 1000, 4),
+                "p95_ms": round(_percentile(values, 95) * 1000, 4),
+                "p99_ms": round(_percentile(values, 99) * 1000, 4),
+            })
+        return rows
+
+    def save_csv(self, dirpath: str = "logs") -> str:
+        os.makedirs(dirpath, exist_ok=True)
+        path = os.path.join(dirpath, f"parse-timings-{self.session_id}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=["stage", "count", "total_ms", "mean_ms", "p50_ms", "p95_ms", "p99_ms"]
+            )
+            writer.writeheader()
+            for row in self.summary():
+                writer.writerow(row)
+        self.csv_path = path
+        return path
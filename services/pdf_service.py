@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+# 200 DPI keeps small print on business cards legible for OCR without huge bitmaps.
+DEFAULT_DPI = 200
+DEFAULT_MAX_PAGES = 50
+
+
+class PdfError(Exception):
+    """The PDF could not be opened or a page could not be rendered (encrypted, damaged)."""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name) or default))
+    except ValueError:
+        return default
+
+
+def is_pdf(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(5) == b"%PDF-"
+    except OSError:
+        return False
+
+
+def _max_pages() -> int:
+    return _env_int("OCR_PDF_MAX_PAGES", DEFAULT_MAX_PAGES)
+
+
+def pdf_page_count(pdf_path: str, max_pages: Optional[int] = None) -> int:
+    """Number of pages ``iter_pdf_pages`` would yield, without rendering any of them."""
+    import pypdfium2 as pdfium
+
+    try:
+        pdf = pdfium.PdfDocument(str(pdf_path))
+    except pdfium.PdfiumError as exc:
+        raise PdfError(str(exc)) from exc
+    try:
+        return min(len(pdf), max_pages or _max_pages())
+    finally:
+        pdf.close()
+
+
+def iter_pdf_pages(
+    pdf_path: str,
+    out_dir: Optional[str] = None,
+    dpi: Optional[int] = None,
+    max_pages: Optional[int] = None,
+) -> Iterator[str]:
+    """Rasterize a PDF lazily, one page at a time, yielding one image path per page.
+
+    Only the page being rendered is held in memory; each page is written next to
+    the PDF (or into ``out_dir``) as a grayscale PNG before the next one is
+    rendered, so a long scanned PDF costs one page bitmap of RAM. Stops after
+    ``max_pages`` (``OCR_PDF_MAX_PAGES``, default 50).
+    """
+    import pypdfium2 as pdfium  # Lazy import: only needed when a PDF is uploaded
+
+    dpi = dpi or _env_int("OCR_PDF_DPI", DEFAULT_DPI)
+    max_pages = max_pages or _max_pages()
+    src = Path(pdf_path)
+    target = Path(out_dir) if out_dir else src.parent
+    try:
+        pdf = pdfium.PdfDocument(str(src))
+    except pdfium.PdfiumError as exc:
+        raise PdfError(str(exc)) from exc
+    try:
+        for index in range(min(len(pdf), max_pages)):
+            out_path = target / f"{src.stem}_p{index + 1}.png"
+            try:
+                _render_page(pdf, index, dpi, out_path)
+            except pdfium.PdfiumError as exc:
+                raise PdfError(f"page {index + 1}: {exc}") from exc
+            yield str(out_path)
+    finally:
+        pdf.close()
+
+
+def _render_page(pdf, index: int, dpi: int, out_path: Path) -> None:
+    page = pdf[index]
+    try:
+        bitmap = page.render(scale=dpi / 72, grayscale=True)
+        try:
+            image = bitmap.to_pil()
+            image.save(out_path, format="PNG")
+            image.close()
+        finally:
+            bitmap.close()
+    finally:
+        page.close()
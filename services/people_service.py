@@ -4,11 +4,14 @@ import os
 import base64
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from PIL import Image
 
 
+PERSON_FIELDS = "names,emailAddresses,phoneNumbers,organizations,addresses,urls,biographies,metadata"
+
+
 def build_google_service(credentials: Any):
     """Lazy import to avoid hard dependency during tests."""
     from googleapiclient.discovery import build
@@ -46,6 +49,25 @@ def unify_schema_to_people_body(data: Dict) -> Dict:
     return body
 
 
+def person_etag(person: Dict) -> Optional[str]:
+    etag = person.get("etag")
+    if not etag:
+        sources = (person.get("metadata") or {}).get("sources") or []
+        if sources:
+            etag = sources[0].get("etag")
+    return etag or None
+
+
+def is_etag_conflict(exc: Exception) -> bool:
+    """Whether ``exc`` is the People API rejecting an update because the contact's etag moved on
+    (a googleapiclient HttpError with 400 FAILED_PRECONDITION, or 409)."""
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    content = getattr(exc, "content", b"") or b""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", "replace")
+    return status == 409 or (status == 400 and ("FAILED_PRECONDITION" in content or "failedPrecondition" in content))
+
+
 def fields_from_body(body: Dict) -> str:
     keys = []
     mapping = {
@@ -74,22 +96,28 @@ class PeopleService:
             self._service = build_google_service(self.credentials)
         return self._service
 
-    def list_connections(self, page_size: int = 500) -> List[Dict]:
-        people = []
+    def iter_connections(self, page_size: int = 500) -> Iterator[Dict]:
+        """Yield contacts page by page, so callers can compact them without holding every page."""
         page_token = None
         while True:
             req = self.service.people().connections().list(
                 resourceName="people/me",
                 pageSize=page_size,
                 pageToken=page_token,
-                personFields="names,emailAddresses,phoneNumbers,organizations,addresses,urls,biographies,metadata",
+                personFields=PERSON_FIELDS,
             )
             res = req.execute()
-            people.extend(res.get("connections", []))
+            yield from res.get("connections", [])
             page_token = res.get("nextPageToken")
             if not page_token:
                 break
-        return people
+
+    def list_connections(self, page_size: int = 500) -> List[Dict]:
+        return list(self.iter_connections(page_size))
+
+    def get_contact(self, resource_name: str) -> Dict:
+        req = self.service.people().get(resourceName=resource_name, personFields=PERSON_FIELDS)
+        return req.execute()
 
     def create_contact(self, data: Dict) -> Dict:
         body = unify_schema_to_people_body(data)
@@ -98,13 +126,7 @@ class PeopleService:
 
     def update_contact(self, resource_name: str, data: Dict, etag: Optional[str] = None) -> Dict:
         body = unify_schema_to_people_body(data)
-        etag_value = etag or data.get("etag")
-        if not etag_value:
-            metadata = data.get("metadata")
-            if metadata:
-                sources = metadata.get("sources") or []
-                if sources:
-                    etag_value = sources[0].get("etag")
+        etag_value = etag or person_etag(data)
         if etag_value:
             body["etag"] = etag_value
         fields = fields_from_body(body)
@@ -115,6 +137,17 @@ class PeopleService:
         )
         return req.execute()
 
+    def update_contact_or_refresh(self, resource_name: str, data: Dict, etag: Optional[str]) -> Dict:
+        """update_contact with the etag from the caller's snapshot; the contact is read again
+        only when there is no etag or the API reports it stale, and the update is retried once."""
+        if etag:
+            try:
+                return self.update_contact(resource_name, data, etag=etag)
+            except Exception as exc:
+                if not is_etag_conflict(exc):
+                    raise
+        return self.update_contact(resource_name, data, etag=person_etag(self.get_contact(resource_name)))
+
     def update_contact_photo(self, resource_name: str, image_path: str) -> Dict:
         if not resource_name or not image_path:
             return {}
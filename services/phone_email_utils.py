@@ -1,22 +1,54 @@
 from __future__ import annotations
 
+import os
 import re
-from typing import Optional, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 import phonenumbers
+from phonenumbers import PhoneMetadata
 from email_validator import validate_email as _validate_email, EmailNotValidError
 
 
 E164_PATTERN = re.compile(r"^\+\d{6,15}$")
 
 
+def _cache_size() -> int:
+    try:
+        return max(0, int(os.getenv("NORMALIZE_CACHE_SIZE") or 16384))
+    except ValueError:
+        return 16384
+
+
+# The same numbers/addresses are normalized again and again (parsing, match keys for
+# every contact on every review/apply, form handling); phonenumbers and
+# email_validator are the expensive part, so results are memoized.
+_CACHE_SIZE = _cache_size()
+
+
 def normalize_phone(value: str, default_region: str = "TW") -> Optional[str]:
     if not value:
         return None
+    return _normalize_phone_cached(value, default_region)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _normalize_phone_cached(value: str, default_region: str) -> Optional[str]:
+    s = _phone_candidate(value, default_region)
+    if not _phone_plausible(s, default_region):
+        return None
+    return _normalize_phone_full(s, default_region)
+
+
+def _phone_candidate(value: str, default_region: str) -> str:
     s = re.sub(r"[\s\-()\.]+", "", value)
     # Convert Taiwan mobile like 09xx... to +8869...
     if s.startswith("09") and default_region.upper() == "TW":
         s = "+886" + s[1:]
+    return s
+
+
+def _normalize_phone_full(s: str, default_region: str) -> Optional[str]:
     try:
         if s.startswith("+"):
             num = phonenumbers.parse(s, None)
@@ -31,14 +63,80 @@ def normalize_phone(value: str, default_region: str = "TW") -> Optional[str]:
     return s if E164_PATTERN.match(s) else None
 
 
+# Cheap structural checks in front of phonenumbers. Most PHONE_RE hits that are
+# not phone numbers (zip codes, tax IDs, dates) are rejected here; every check
+# only returns False when the full path above would also return None.
+def _global_min_digits() -> int:
+    lengths = [
+        length
+        for region in phonenumbers.SUPPORTED_REGIONS
+        for length in PhoneMetadata.metadata_for_region(region).general_desc.possible_length
+        if length > 0
+    ]
+    # National-prefix transform rules can add digits, but every one of them only
+    # fires on a longer capture than this, and the E.164 fallback needs 6 digits.
+    return min(6, min(lengths))
+
+
+_GLOBAL_MIN_DIGITS = _global_min_digits()
+
+
+@lru_cache(maxsize=None)
+def _region_rules(region: str) -> Optional[Tuple[int, "re.Pattern[str]"]]:
+    """(min national number length, IDD pattern) for ``region``, or None if the length check is unsafe."""
+    metadata = PhoneMetadata.metadata_for_region(region)
+    if metadata is None or not metadata.international_prefix:
+        return None
+    shared = [PhoneMetadata.metadata_for_region(r) for r in phonenumbers.region_codes_for_country_code(metadata.country_code)]
+    if any(m is None or m.national_prefix_transform_rule for m in shared):
+        return None
+    min_length = min(length for m in shared for length in m.general_desc.possible_length if length > 0)
+    return min_length, re.compile(metadata.international_prefix)
+
+
+def _phone_plausible(s: str, default_region: str) -> bool:
+    digits = sum(ch.isdigit() for ch in s)
+    if not digits:
+        return False
+    # Letters may be vanity digits (1-800-FLOWERS), so they count towards the length.
+    if digits + sum(ch.isalpha() for ch in s) < _GLOBAL_MIN_DIGITS:
+        return False
+    if s.isascii() and s.isdigit():
+        # A national number is a subset of the input digits unless an IDD switches the country.
+        rules = _region_rules(default_region)
+        if rules is not None and digits < rules[0] and not rules[1].match(s):
+            return False
+    return True
+
+
 def is_e164(phone: str) -> bool:
     return bool(phone and E164_PATTERN.match(phone))
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
+def is_mobile_phone(phone: str) -> bool:
+    """Whether an E.164 number is a mobile line (someone's own, unlike a company switchboard)."""
+    try:
+        num = phonenumbers.parse(phone, None)
+    except phonenumbers.NumberParseException:
+        return False
+    return phonenumbers.number_type(num) == phonenumbers.PhoneNumberType.MOBILE
+
+
 def validate_email(email: str) -> Optional[str]:
     if not email:
         return None
-    email = email.strip()
+    return _validate_email_cached(email.strip())
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _validate_email_cached(email: str) -> Optional[str]:
+    if not _email_plausible(email):
+        return None
+    return _validate_email_full(email)
+
+
+def _validate_email_full(email: str) -> Optional[str]:
     try:
         info = _validate_email(email, allow_smtputf8=True, check_deliverability=False)
         # normalized field is recommended
@@ -47,6 +145,44 @@ def validate_email(email: str) -> Optional[str]:
         return None
 
 
+def _email_plausible(email: str) -> bool:
+    """Syntax checks that email_validator would fail anyway (quoted local parts are not allowed)."""
+    if email.count("@") != 1:
+        return False
+    local, domain = email.split("@")
+    if not local or not domain:
+        return False
+    # IDNA maps full-width/ideographic full stops to ".", so only ASCII domains must contain one.
+    if domain.isascii() and "." not in domain:
+        return False
+    for part in (local, domain):
+        if part.startswith(".") or part.endswith(".") or ".." in part:
+            return False
+    return True
+
+
+def normalization_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Hits, misses, size and hit rate of the phone/email normalization caches."""
+    stats: Dict[str, Dict[str, float]] = {}
+    for name, fn in (("phone", _normalize_phone_cached), ("email", _validate_email_cached)):
+        info = fn.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
+def clear_normalization_caches() -> None:
+    _normalize_phone_cached.cache_clear()
+    _validate_email_cached.cache_clear()
+    is_mobile_phone.cache_clear()
+
+
 def dedupe_values(items: List[dict], key: str = "value") -> List[dict]:
     seen = set()
     out: List[dict] = []
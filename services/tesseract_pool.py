@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from typing import Any, Optional
+
+from PIL import Image
+
+try:  # Optional native binding: keeps Tesseract and its language models loaded in-process
+    import tesserocr  # type: ignore
+except Exception:  # pragma: no cover - falls back to the pytesseract subprocess
+    tesserocr = None  # type: ignore
+
+
+DEFAULT_LANG = "eng"
+
+
+class TesseractPool:
+    """Bounded pool of warm Tesseract engines shared by the OCR workers.
+
+    With ``tesserocr`` installed each engine is an initialized ``PyTessBaseAPI``
+    that is reused across images (no process start, no model reload), and the
+    binding releases the GIL so several cards are recognized in parallel.
+    Without it, calls go through ``pytesseract`` but at most ``size`` subprocesses
+    run at once, which keeps memory flat on small instances.
+    """
+
+    def __init__(self, size: int = 2, lang: str = DEFAULT_LANG) -> None:
+        self.size = max(1, size)
+        self.lang = lang
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def recognize(self, image_path: str) -> str:
+        with self._slots:
+            if tesserocr is None:
+                return self._recognize_subprocess(image_path)
+            api = self._acquire()
+            try:
+                with Image.open(image_path) as img:
+                    api.SetImage(img)
+                    return api.GetUTF8Text() or ""
+            finally:
+                api.Clear()
+                self._idle.put(api)
+
+    def _acquire(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return tesserocr.PyTessBaseAPI(lang=self.lang)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get()
+
+    def _recognize_subprocess(self, image_path: str) -> str:
+        import pytesseract
+
+        with Image.open(image_path) as img:
+            return pytesseract.image_to_string(img, lang=self.lang)
+
+    def close(self) -> None:
+        while True:
+            try:
+                api = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            api.End()
+            with self._lock:
+                self._created -= 1
+
+
+_pool: Optional[TesseractPool] = None
+_pool_lock = threading.Lock()
+
+
+def configured_lang() -> str:
+    return os.getenv("OCR_TESSERACT_LANG") or DEFAULT_LANG
+
+
+def get_pool() -> TesseractPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                try:
+                    size = int(os.getenv("OCR_TESSERACT_WORKERS") or 2)
+                except ValueError:
+                    size = 2
+                _pool = TesseractPool(size=size, lang=configured_lang())
+    return _pool
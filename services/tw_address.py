@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .keyword_matcher import KeywordMatcher
+
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "tw_gazetteer.json"
+
+# Points per kind of gazetteer hit (each kind counts once per line). A line at or
+# above MIN_SCORE is an address; phone/fax/tax-ID/email markers push a line below it.
+WEIGHTS: Dict[str, int] = {
+    "city": 3,
+    "district": 3,
+    "prefix": 3,
+    "road": 2,
+    "number": 2,
+    "english": 2,
+    "section": 1,
+    "lane": 1,
+    "floor": 1,
+    "digit": 1,
+    "contact": -6,
+}
+MIN_SCORE = 4
+
+_matcher: Optional[KeywordMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def _keywords(data: Dict) -> Iterable[Tuple[str, str]]:
+    for city, districts in data["cities"].items():
+        for label, names in (("city", [city]), ("district", districts)):
+            for name in names:
+                yield name, label
+                if "臺" in name:
+                    yield name.replace("臺", "台"), label
+    for key, label in (
+        ("roads", "road"), ("sections", "section"), ("lanes", "lane"), ("numbers", "number"),
+        ("floors", "floor"), ("prefixes", "prefix"), ("english", "english"), ("contact", "contact"),
+    ):
+        for word in data[key]:
+            yield word, label
+
+
+def get_matcher() -> KeywordMatcher:
+    """Automaton over the gazetteer (services/data/tw_gazetteer.json), built on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                data = json.loads(GAZETTEER_PATH.read_text("utf-8"))
+                _matcher = KeywordMatcher(_keywords(data))
+    return _matcher
+
+
+def address_score(line: str) -> int:
+    """How much ``line`` looks like a postal address; see WEIGHTS."""
+    compact = "".join(line.split())  # OCR often breaks 台 北市 apart
+    labels = get_matcher().labels(compact)
+    if any(ch.isdigit() for ch in compact):
+        labels.add("digit")
+    return sum(WEIGHTS[label] for label in labels)
+
+
+def best_address_index(lines: List[str]) -> Optional[int]:
+    """Index of the highest-scoring line (the later one on ties) if any reaches MIN_SCORE."""
+    best, best_score = None, MIN_SCORE
+    for idx, ln in enumerate(lines):
+        score = address_score(ln)
+        if score >= best_score:
+            best, best_score = idx, score
+    return best
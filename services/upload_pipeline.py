@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import image_hash
+from .ocr_service import submit_text_many
+from .pdf_service import is_pdf, iter_pdf_pages, pdf_page_count
+
+
+def count_cards(upload_paths: List[str]) -> int:
+    """Cards an upload will produce: one per image, one per PDF page (capped by OCR_PDF_MAX_PAGES).
+
+    Only opens the PDFs; nothing is rendered. Raises pdf_service.PdfError for an
+    unreadable PDF.
+    """
+    return sum(pdf_page_count(path_str) if is_pdf(path_str) else 1 for path_str in upload_paths)
+
+
+def iter_cards(
+    file_names: List[str], upload_paths: List[str], page_paths: List[str]
+) -> Iterator[Tuple[str, str, bool]]:
+    """Yield (name, image path, rendered) per card. PDF pages are rendered only as they are asked for;
+    every page image written is recorded in ``page_paths``. A PDF is deleted once all its pages are out."""
+    for name, path_str in zip(file_names, upload_paths):
+        if not is_pdf(path_str):
+            yield name, path_str, False
+            continue
+        for page_no, page_path in enumerate(iter_pdf_pages(path_str), start=1):
+            page_paths.append(page_path)
+            yield f"{name}（第 {page_no} 頁）", page_path, True
+        Path(path_str).unlink(missing_ok=True)
+
+
+def dedupe_and_ocr(
+    user_key: str, file_names: List[str], upload_paths: List[str]
+) -> Tuple[List[str], List[str], List[str], List[Dict[str, Any]]]:
+    """OCR an upload, one card per image or PDF page; returns (names, image paths, texts, duplicates).
+
+    Cards go to OCR as soon as they are on disk: uploaded images are sent together
+    with the first rendered page, and each later PDF page is OCR'd while the next
+    one renders. A near-identical image (OCR_DUP_DETECTION) is not OCR'd again: it
+    stays in the batch with the first card's text and is listed in ``duplicates``
+    as ``{"index", "filename", "duplicate_of"}``. If anything fails, the page
+    images rendered so far are deleted before the error is raised; the uploads
+    themselves are left to the caller.
+    """
+    batch_dedupe = image_hash.batch_dedupe_enabled()
+    use_recent = bool(user_key) and image_hash.recent_dedupe_enabled()
+    hashing = batch_dedupe or use_recent
+
+    names: List[str] = []
+    paths: List[str] = []
+    prints: List[Any] = []
+    ocr_list: List[Optional[str]] = []
+    duplicates: List[Dict[str, Any]] = []
+    firsts: List[Tuple[int, Any]] = []
+    first_of: Dict[int, int] = {}
+    ready: List[int] = []
+    jobs: List[Tuple[List[int], Future]] = []
+    page_paths: List[str] = []
+
+    def flush() -> None:
+        if ready:
+            jobs.append((list(ready), submit_text_many([paths[idx] for idx in ready])))
+            ready.clear()
+
+    try:
+        for name, path_str, rendered in iter_cards(file_names, upload_paths, page_paths):
+            fp = image_hash.fingerprint(path_str) if hashing else None
+            idx = len(paths)
+            names.append(name)
+            paths.append(path_str)
+            prints.append(fp)
+            ocr_list.append(None)
+            if batch_dedupe and fp is not None:
+                first = image_hash.first_near_duplicate(fp, firsts)
+                if first is not None:
+                    first_of[idx] = first
+                    duplicates.append({"index": idx, "filename": name, "duplicate_of": names[first]})
+                    continue
+                firsts.append((idx, fp))
+            if use_recent and fp is not None:
+                ocr_list[idx] = image_hash.recent_hashes.find(user_key, fp)
+            if ocr_list[idx] is None:
+                ready.append(idx)
+            if rendered:
+                flush()
+        flush()
+
+        for todo, job in jobs:
+            for idx, txt in zip(todo, job.result()):
+                ocr_list[idx] = txt
+                if use_recent and prints[idx] is not None:
+                    image_hash.recent_hashes.add(user_key, prints[idx], txt)
+    except Exception:
+        # Let jobs still reading the pages finish before the pages go away.
+        wait([job for _, job in jobs])
+        for page_path in page_paths:
+            Path(page_path).unlink(missing_ok=True)
+        raise
+    for idx, first in first_of.items():
+        ocr_list[idx] = ocr_list[first]
+    return names, paths, [txt or "" for txt in ocr_list], duplicates
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_ENDPOINT = "https://vision.googleapis.com/v1/images:annotate"
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class VisionError(Exception):
+    """Vision could not be reached or kept failing after retries."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+class VisionClient:
+    """Keep-alive ``images:annotate`` client with jittered exponential backoff.
+
+    Only connection errors, timeouts and ``RETRYABLE_STATUS`` responses are
+    retried (annotate is read-only, so a repeated POST is safe); other errors
+    raise ``VisionError`` right away.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = DEFAULT_ENDPOINT,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        pool_size: int = 10,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.endpoint = endpoint
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def annotate(self, entries: List[Dict], api_key: str) -> List[Dict]:
+        """POST one annotate batch; return the ``responses`` list (one per entry)."""
+        last_error: Optional[VisionError] = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                resp = self.session.post(
+                    self.endpoint,
+                    params={"key": api_key},
+                    json={"requests": entries},
+                    timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                last_error = VisionError(f"Vision request failed: {exc}")
+            else:
+                if resp.status_code == 200:
+                    try:
+                        return resp.json().get("responses") or []
+                    except ValueError as exc:
+                        raise VisionError(f"Vision returned invalid JSON: {exc}", 200) from exc
+                if resp.status_code not in RETRYABLE_STATUS:
+                    raise VisionError(f"Vision returned HTTP {resp.status_code}", resp.status_code)
+                last_error = VisionError(f"Vision returned HTTP {resp.status_code}", resp.status_code)
+                retry_after = resp.headers.get("Retry-After")
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, retry_after))
+        raise last_error or VisionError("Vision request failed")
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        # "Full jitter": spreads retries from concurrent workers instead of syncing them.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+_client: Optional[VisionClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> VisionClient:
+    """Module-level client shared by all OCR workers, configured from the environment."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = VisionClient(
+                    endpoint=os.getenv("VISION_ENDPOINT") or DEFAULT_ENDPOINT,
+                    connect_timeout=_env_float("VISION_CONNECT_TIMEOUT", 5.0),
+                    read_timeout=_env_float("VISION_READ_TIMEOUT", 30.0),
+                    max_retries=int(_env_float("VISION_MAX_RETRIES", 3)),
+                    pool_size=max(10, int(_env_float("OCR_MAX_WORKERS", 4))),
+                )
+    return _client
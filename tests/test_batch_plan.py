@@ -0,0 +1,97 @@
+from services.dedupe_service import cluster_cards, merge_cards, plan_batch
+
+
+def _card(name, company, title="", phones=(), emails=(), notes=""):
+    return {
+        "name": {"fullName": name},
+        "organization": {"company": company, "title": title},
+        "phones": [{"type": "mobile", "value": p} for p in phones],
+        "emails": [{"type": "work", "value": e} for e in emails],
+        "addresses": [],
+        "urls": [],
+        "notes": notes,
+    }
+
+
+def test_cluster_groups_same_person_in_first_seen_order():
+    cards = [
+        _card("王小明", "能量叢林"),
+        _card("Alice", "ACME"),
+        _card("王小明", "能量叢林", phones=["0912345678"]),
+        _card("", "ACME"),
+        _card("", "ACME"),
+    ]
+    assert cluster_cards(cards) == [[0, 2], [1], [3], [4]]
+
+
+def test_merge_unions_values_and_keeps_primary_fields():
+    merged = merge_cards([
+        _card("王小明", "能量叢林", phones=["+886912345678"], emails=["a@x.com"], notes="展會"),
+        _card("王小明", "能量叢林", title="經理", phones=["+886912345678", "+886222345678"], notes="展會"),
+        _card("王小明", "能量叢林", title="協理", emails=["b@x.com"], notes="複訪"),
+    ])
+    assert merged["name"]["fullName"] == "王小明"
+    assert merged["organization"] == {"company": "能量叢林", "title": "經理"}
+    assert [p["value"] for p in merged["phones"]] == ["+886912345678", "+886222345678"]
+    assert [e["value"] for e in merged["emails"]] == ["a@x.com", "b@x.com"]
+    assert merged["notes"] == "展會\n複訪"
+
+
+def test_plan_writes_once_per_person():
+    cards = [
+        _card("王小明", "能量叢林", emails=["a@x.com"]),
+        _card("王小明", "能量叢林", emails=["a@x.com"]),
+        _card("Alice", "ACME"),
+    ]
+    plan = plan_batch(cards, [])
+    assert [g["members"] for g in plan] == [[0, 1], [2]]
+    assert [g["action"] for g in plan] == ["create", "create"]
+
+
+def test_plan_updates_existing_contact_with_merged_values():
+    existing = [{
+        "resourceName": "people/c1",
+        "names": [{"displayName": "王小明"}],
+        "organizations": [{"name": "能量叢林"}],
+        "emailAddresses": [{"value": "a@x.com"}],
+    }]
+    cards = [
+        _card("王小明", "能量叢林", emails=["a@x.com"]),
+        _card("王小明", "能量叢林", phones=["+886912345678"]),
+    ]
+    (group,) = plan_batch(cards, existing)
+    assert group["action"] == "update"
+    assert group["matched"]["resourceName"] == "people/c1"
+    assert [p["value"] for p in group["data"]["phones"]] == ["+886912345678"]
+
+
+def test_clusters_resolving_to_one_contact_are_written_once():
+    existing = [{
+        "resourceName": "people/c1",
+        "names": [{"displayName": "王小明"}],
+        "organizations": [{"name": "能量叢林"}],
+        "phoneNumbers": [{"value": "+886912345678"}],
+    }]
+    cards = [
+        _card("王小明", "能量叢林", emails=["a@x.com"]),
+        _card("Alice", "ACME"),
+        _card("王小朋", "能量叢林", phones=["+886912345678"], emails=["b@x.com"]),
+    ]
+    plan = plan_batch(cards, existing)
+    assert [g["members"] for g in plan] == [[0, 2], [1]]
+    assert plan[0]["action"] == "update" and plan[0]["matched"]["resourceName"] == "people/c1"
+    assert [e["value"] for e in plan[0]["updates"]["emailAddresses"]] == ["a@x.com", "b@x.com"]
+
+
+def test_cards_sharing_email_and_phone_with_a_name_slip_are_one_person(monkeypatch):
+    monkeypatch.delenv("FUZZY_MATCH", raising=False)
+    cards = [
+        _card("陳志明", "能量叢林", phones=["0912345678"], emails=["cm@x.com"]),
+        _card("陳志朋", "能量叢林", phones=["0912345678"], emails=["cm@x.com"]),
+        # Colleagues on the company switchboard stay apart.
+        _card("陳志光", "能量叢林", phones=["0223456789"]),
+        _card("陳志亮", "能量叢林", phones=["0223456789"]),
+    ]
+    assert cluster_cards(cards) == [[0, 1], [2], [3]]
+    plan = plan_batch(cards[:2], [])
+    assert [(g["members"], g["action"]) for g in plan] == [([0, 1], "create")]
@@ -0,0 +1,66 @@
+from services import circuit_breaker, ocr_service
+from services.circuit_breaker import CircuitBreaker
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_on_failure_rate_then_half_open_probe_closes():
+    clock = _Clock()
+    breaker = CircuitBreaker("t", min_calls=4, failure_rate=0.5, cooldown_seconds=30, clock=clock)
+    for _ in range(2):
+        breaker.record_success(0.1)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == circuit_breaker.OPEN
+    assert breaker.allow() is False
+    assert breaker.status()["rejected"] == 1
+
+    clock.now = 31
+    assert breaker.state == circuit_breaker.HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # only one probe at a time
+    breaker.record_success(0.1)
+    assert breaker.state == circuit_breaker.CLOSED
+
+
+def test_failed_probe_reopens_and_slow_calls_open():
+    clock = _Clock()
+    breaker = CircuitBreaker("t", min_calls=2, slow_call_seconds=5, slow_call_rate=1.0, cooldown_seconds=10, clock=clock)
+    breaker.record_success(6)
+    breaker.record_success(7)
+    assert breaker.state == circuit_breaker.OPEN
+
+    clock.now = 11
+    assert breaker.allow() is True
+    breaker.record_failure()
+    assert breaker.state == circuit_breaker.OPEN
+    assert breaker.status()["times_opened"] == 2
+
+
+def test_open_vision_circuit_goes_straight_to_fallback(monkeypatch, tmp_path):
+    calls = []
+
+    class FailingClient:
+        def annotate(self, entries, api_key):
+            calls.append(len(entries))
+            raise ocr_service.vision_client.VisionError("down", 503)
+
+    breaker = CircuitBreaker("vision", min_calls=2, failure_rate=0.5, cooldown_seconds=60)
+    monkeypatch.setattr(ocr_service, "_vision_breaker", breaker)
+    monkeypatch.setattr(ocr_service.vision_client, "get_client", lambda: FailingClient())
+    monkeypatch.setattr(ocr_service, "_extract_with_fallback", lambda path: "fallback")
+    monkeypatch.setenv("VISION_API_KEY", "k")
+    monkeypatch.setenv("OCR_CACHE", "off")
+    card = tmp_path / "card.png"
+    card.write_bytes(b"img")
+
+    for _ in range(3):
+        assert ocr_service.extract_text(str(card)) == "fallback"
+    assert calls == [1, 1]
+    assert ocr_service.vision_status()["state"] == circuit_breaker.OPEN
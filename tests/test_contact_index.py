@@ -0,0 +1,80 @@
+import random
+
+from services.dedupe_service import (
+    ContactIndex,
+    build_keys_from_person,
+    build_keys_from_schema,
+    decide_action,
+)
+
+
+def _linear_best(candidate, people):
+    """The original O(contacts) scan, kept as the reference for scoring and tie-breaks."""
+    cand = build_keys_from_schema(candidate)
+    best, best_score = None, -1
+    for p in people:
+        keys = build_keys_from_person(p)
+        score = 3 * bool(set(cand["emails"]) & set(keys["emails"]))
+        score += 2 * bool(set(cand["phones"]) & set(keys["phones"]))
+        score += bool(set(cand["name_company"]) & set(keys["name_company"]))
+        if score > best_score:
+            best, best_score = p, score
+    return best if best_score > 0 else None
+
+
+NAMES = ["Alice", "Bob", "王大明", "林小華"]
+COMPANIES = ["ACME", "能量叢林", "Globex"]
+EMAILS = ["a@x.com", "b@x.com", "c@y.com", "d@y.com"]
+PHONES = ["+886912345678", "+886922111333", "+14155550100"]
+
+
+def _person(rnd, idx):
+    return {
+        "resourceName": f"people/c{idx}",
+        "names": [{"displayName": rnd.choice(NAMES)}],
+        "organizations": [{"name": rnd.choice(COMPANIES)}],
+        "emailAddresses": [{"value": e} for e in rnd.sample(EMAILS, rnd.randint(0, 2))],
+        "phoneNumbers": [{"value": p} for p in rnd.sample(PHONES, rnd.randint(0, 2))],
+    }
+
+
+def _card(rnd):
+    return {
+        "name": {"fullName": rnd.choice(NAMES)},
+        "organization": {"company": rnd.choice(COMPANIES)},
+        "emails": [{"value": e} for e in rnd.sample(EMAILS, rnd.randint(0, 2))],
+        "phones": [{"value": p} for p in rnd.sample(PHONES, rnd.randint(0, 2))],
+    }
+
+
+def test_index_matches_linear_scan():
+    rnd = random.Random(3)
+    for _ in range(40):
+        people = [_person(rnd, i) for i in range(rnd.randint(0, 12))]
+        index = ContactIndex(people)
+        for _ in range(10):
+            card = _card(rnd)
+            best, _, score = index.best_match(build_keys_from_schema(card))
+            assert (best if score > 0 else None) is _linear_best(card, people)
+            assert decide_action(card, index)[:2] == decide_action(card, people)[:2]
+
+
+def test_upsert_replaces_in_place_and_reindexes():
+    first = {"resourceName": "people/c1", "emailAddresses": [{"value": "a@x.com"}],
+             "names": [{"displayName": "Alice"}], "organizations": [{"name": "ACME"}]}
+    second = {"resourceName": "people/c2", "emailAddresses": [{"value": "a@x.com"}],
+              "names": [{"displayName": "Alice"}], "organizations": [{"name": "ACME"}]}
+    index = ContactIndex([first, second])
+    card = {"name": {"fullName": "Alice"}, "organization": {"company": "ACME"}, "emails": [{"value": "a@x.com"}]}
+    assert decide_action(card, index)[1] is first
+
+    moved = dict(first, emailAddresses=[{"value": "new@x.com"}])
+    index.upsert(moved)
+    assert len(index) == 2 and index.people()[0] is moved
+    assert decide_action(card, index)[1] is second
+
+    created = {"resourceName": "people/c3", "emailAddresses": [{"value": "z@x.com"}],
+               "names": [{"displayName": "Zed"}], "organizations": [{"name": "ACME"}]}
+    index.upsert(created)
+    zed = {"name": {"fullName": "Zed"}, "organization": {"company": "ACME"}, "emails": [{"value": "z@x.com"}]}
+    assert decide_action(zed, index)[1] is created
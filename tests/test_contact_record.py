@@ -0,0 +1,49 @@
+from scripts.contact_corpus import generate_candidates, generate_connections
+from services.contact_record import ContactRecord, compact_people
+from services.dedupe_service import ContactIndex, build_keys_from_person, compute_updates, decide_action
+from services.match_key_cache import MatchKeyCache
+
+
+def test_record_reads_like_the_person_it_came_from():
+    people = generate_connections(200, seed=4)
+    for person in people:
+        record = ContactRecord.from_person(person)
+        assert not hasattr(record, "__dict__")
+        assert record["resourceName"] == person["resourceName"]
+        assert record.get("etag") == person["etag"]
+        assert build_keys_from_person(record) == build_keys_from_person(person)
+
+
+def test_record_takes_etag_from_metadata_and_interns_names():
+    a = ContactRecord.from_person({
+        "resourceName": "people/c1",
+        "metadata": {"sources": [{"etag": "e1"}]},
+        "organizations": [{"name": "".join(["能量", "叢林"])}],
+    })
+    b = ContactRecord.from_person({"resourceName": "people/c2", "organizations": [{"name": "".join(["能量", "叢林"])}]})
+    assert a.etag == "e1" and b.get("etag") is None
+    assert a.company is b.company
+    assert a.get("names") is None and a.get("phoneNumbers") is None
+
+
+def test_decisions_match_full_person_dicts():
+    people = generate_connections(500, seed=4)
+    cards = [card for card, _ in generate_candidates(people, 120, overlap=0.5, seed=4)]
+    by_dict = ContactIndex(people)
+    by_record = ContactIndex(compact_people(iter(people)))
+    for card in cards:
+        action, matched, updates = decide_action(card, by_dict)
+        action_r, matched_r, updates_r = decide_action(card, by_record)
+        assert action_r == action
+        assert (matched_r and matched_r["resourceName"]) == (matched and matched["resourceName"])
+        if matched:
+            assert updates_r.keys() == updates.keys()
+            assert compute_updates(card, matched_r).keys() == compute_updates(card, matched).keys()
+
+
+def test_key_cache_accepts_records(tmp_path):
+    person = generate_connections(1, seed=4)[0]
+    cache = MatchKeyCache(tmp_path / "keys.json")
+    keys = cache.keys_for(ContactRecord.from_person(person))
+    assert keys == cache.keys_for(person) == build_keys_from_person(person)
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,29 @@
+from scripts.contact_corpus import generate_candidates, generate_connections
+from scripts.dedupe_benchmark import run
+from services.dedupe_service import build_keys_from_person
+
+
+def test_connections_are_seeded_people_api_resources():
+    people = generate_connections(50, seed=3)
+    assert people == generate_connections(50, seed=3)
+    assert len({p["resourceName"] for p in people}) == 50
+    person = people[0]
+    assert person["etag"] == person["metadata"]["sources"][0]["etag"]
+    assert person["names"][0]["displayName"]
+    assert any(build_keys_from_person(p)["phones"] for p in people)
+
+
+def test_candidates_follow_overlap_rate():
+    people = generate_connections(200, seed=3)
+    pairs = generate_candidates(people, 400, overlap=0.25, seed=3)
+    known = {p["resourceName"] for p in people}
+    expected = [exp for _, exp in pairs if exp]
+    assert 60 < len(expected) < 140
+    assert set(expected) <= known
+
+
+def test_benchmark_reports_matches():
+    result = run(300, 60, 0.5)
+    assert result["hit"] + result["miss"] + result["wrong"] > 0
+    assert result["wrong"] == 0 and result["miss"] <= 2
+    assert result["peak_mb"] >= result["book_mb"] > 0
@@ -0,0 +1,27 @@
+from services import parse_service
+from services.parse_service import ENTITY_RE, parse_text_to_schema
+
+
+def test_single_scan_classifies_spans():
+    text = "Tel 02-2345-6789\nhttps://example.com/2023/0912345678\n0912345678@example.com"
+    kinds = [(m.lastgroup, m.group(0)) for m in ENTITY_RE.finditer(text)]
+    assert kinds == [
+        ("phone", "02-2345-6789"),
+        ("url", "https://example.com/2023/0912345678"),
+        ("email", "0912345678@example.com"),
+    ]
+
+
+def test_digits_inside_emails_and_urls_are_not_validated_as_phones(monkeypatch):
+    calls = []
+    real = parse_service.normalize_phone
+
+    def counting(value, *args, **kwargs):
+        calls.append(value)
+        return real(value, *args, **kwargs)
+
+    monkeypatch.setattr(parse_service, "normalize_phone", counting)
+    data = parse_text_to_schema("Amy\nhttps://shop.example/item/0912345678\n0922111333@example.com\nM: 0933-222-111")
+    assert calls == ["0933-222-111"]
+    assert [p["value"] for p in data["phones"]] == ["+886933222111"]
+    assert data["emails"][0]["value"] == "0922111333@example.com"
@@ -0,0 +1,45 @@
+import hashlib
+
+import pytest
+
+from scripts.fake_vision_server import start_server
+from services import ocr_service
+from services.vision_client import VisionClient, VisionError
+
+
+@pytest.fixture
+def fake_vision():
+    servers = []
+
+    def _start(**config):
+        server, url = start_server(**config)
+        servers.append(server)
+        return server, url
+
+    yield _start
+    for server in servers:
+        server.shutdown()
+
+
+def test_extract_text_many_against_fake_endpoint(monkeypatch, tmp_path, fake_vision):
+    cards = []
+    canned = {}
+    for idx in range(3):
+        path = tmp_path / f"card{idx}.bin"
+        path.write_bytes(f"card-{idx}".encode())
+        canned[hashlib.sha256(path.read_bytes()).hexdigest()] = f"text {idx}"
+        cards.append(str(path))
+    server, url = fake_vision(responses=canned)
+    monkeypatch.setenv("VISION_API_KEY", "fake")
+    monkeypatch.setenv("OCR_CACHE", "off")
+    monkeypatch.setattr(ocr_service.vision_client, "get_client", lambda: VisionClient(endpoint=url))
+
+    assert ocr_service.extract_text_many(cards) == ["text 0", "text 1", "text 2"]
+    assert (server.RequestHandlerClass.config.calls, server.RequestHandlerClass.config.images) == (1, 3)
+
+
+def test_fake_endpoint_error_rate(fake_vision):
+    server, url = fake_vision(error_rate=1.0, error_status=429)
+    with pytest.raises(VisionError) as exc:
+        VisionClient(endpoint=url, max_retries=0).annotate([{"image": {"content": ""}}], "fake")
+    assert exc.value.status_code == 429
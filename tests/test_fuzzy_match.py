@@ -0,0 +1,127 @@
+from services.dedupe_service import ContactIndex, cluster_cards, decide_action, plan_batch
+from services.fuzzy_match import FuzzyBlockIndex, fuzzy_text, normalize_company, within_one_edit
+
+
+def _person(idx, name, company, phone=None):
+    person = {
+        "resourceName": f"people/c{idx}",
+        "names": [{"displayName": name}],
+        "organizations": [{"name": company}],
+    }
+    if phone:
+        person["phoneNumbers"] = [{"value": phone}]
+    return person
+
+
+def _card(name, company, phone=None):
+    return {
+        "name": {"fullName": name},
+        "organization": {"company": company},
+        "phones": [{"value": phone}] if phone else [],
+        "emails": [],
+    }
+
+
+def test_normalize_company_drops_legal_suffixes():
+    assert normalize_company("能量叢林股份有限公司") == normalize_company("能量叢林股份公司") == "能量叢林"
+    assert normalize_company("ACME Co., Ltd.") == normalize_company("Acme Inc") == "acme"
+    assert normalize_company("臺灣大哥大") == "台灣大哥大"
+    assert normalize_company("公司") == "公司"
+
+
+def test_block_index_finds_one_character_slip():
+    index = FuzzyBlockIndex(min_ratio=0.85, bucket_cap=100, top_k=4)
+    index.add(0, fuzzy_text("王小明", "能量叢林"))
+    index.add(1, fuzzy_text("林志玲", "能量叢林"))
+    slot, ratio = index.best(fuzzy_text("王小銘", "能量叢林股份有限公司"))
+    assert slot == 0 and 0.85 <= ratio < 1
+    assert index.best(fuzzy_text("王小銘", "能量叢林"), same_name=True)[0] is None
+    # One OCR slip in a four-character company is 0.75 by ratio but one edit away.
+    assert index.best(fuzzy_text("王小明", "能量叢材"), same_name=True) == (0, 0.75)
+    assert index.best(fuzzy_text("王小明", "能源叢材"), same_name=True)[0] is None
+    assert index.best(fuzzy_text("王小明", "能量叢林公司"), same_name=True) == (0, 1.0)
+    index.remove(0)
+    assert index.best(fuzzy_text("王小銘", "能量叢林"))[0] is None
+
+
+def test_within_one_edit():
+    assert within_one_edit("能量叢林", "能量叢材")
+    assert within_one_edit("能量叢林", "能量叢林林") and within_one_edit("acme", "acm")
+    assert not within_one_edit("能量叢林", "能源叢材")
+    assert not within_one_edit("acme", "acmeco")
+
+
+def test_short_companies_need_the_ratio():
+    index = FuzzyBlockIndex(min_ratio=0.85, bucket_cap=100, top_k=4)
+    index.add(0, fuzzy_text("王小明", "台積"))
+    assert index.best(fuzzy_text("王小明", "台電"), same_name=True)[0] is None
+
+
+def test_block_index_skips_crowded_buckets():
+    index = FuzzyBlockIndex(min_ratio=0.5, bucket_cap=2, top_k=4)
+    for slot, name in enumerate(["甲", "乙", "丙"]):
+        index.add(slot, fuzzy_text(name, "科技"))
+    # Every contact shares 科技; with that bucket over the cap nothing is a candidate.
+    assert index.candidates(fuzzy_text("丁", "科技")) == []
+
+
+def test_decide_action_matches_ocr_variant(monkeypatch):
+    monkeypatch.delenv("FUZZY_MATCH", raising=False)
+    people = [_person(i, f"員工{i}", "其他公司") for i in range(50)]
+    people.append(_person(99, "王小明", "能量叢林股份有限公司", "+886912345678"))
+    card = _card("王小銘", "能量叢林股份公司", "+886912345678")
+    action, matched, _ = decide_action(card, ContactIndex(people))
+    assert action in ("update", "skip")
+    assert matched["resourceName"] == "people/c99"
+    # No shared phone or email: the same name at a near-identical company is enough...
+    action, matched, _ = decide_action(_card("王小明", "能量叢林"), ContactIndex(people))
+    assert matched["resourceName"] == "people/c99"
+    # ...but a one-character name difference alone may be a colleague.
+    action, matched, _ = decide_action(_card("王大明", "能量叢林"), ContactIndex(people))
+    assert action == "create" and matched is None
+
+
+def test_switchboard_number_does_not_carry_a_name_slip(monkeypatch):
+    monkeypatch.delenv("FUZZY_MATCH", raising=False)
+    people = [_person(1, "王小明", "綠野電子股份有限公司", "+886223456789")]
+    card = _card("王大明", "綠野電子股份有限公司", "+886223456789")
+    assert decide_action(card, ContactIndex(people)) == ("create", None, {})
+    # A mobile number only that contact has, or a shared email, is personal enough.
+    people = [_person(1, "王小明", "綠野電子股份有限公司", "+886912345678")]
+    assert decide_action(_card("王小銘", "綠野電子", "0912-345-678"), ContactIndex(people))[1] is people[0]
+    people.append(_person(2, "林志玲", "綠野電子", "+886912345678"))
+    assert decide_action(_card("王小銘", "綠野電子", "0912-345-678"), ContactIndex(people))[0] == "create"
+    people = [dict(_person(1, "王小明", "綠野電子", "+886223456789"), emailAddresses=[{"value": "ming@x.com"}])]
+    card = dict(_card("王小銘", "綠野電子", "+886223456789"), emails=[{"value": "ming@x.com"}])
+    assert decide_action(card, ContactIndex(people))[1] is people[0]
+
+
+def test_decide_action_exact_only_when_disabled(monkeypatch):
+    monkeypatch.setenv("FUZZY_MATCH", "off")
+    people = [_person(1, "王小明", "能量叢林股份有限公司", "+886912345678")]
+    action, matched, _ = decide_action(_card("王小銘", "能量叢林股份公司", "+886912345678"), ContactIndex(people))
+    assert action == "create" and matched is None
+
+
+def test_cluster_cards_joins_ocr_variants(monkeypatch):
+    monkeypatch.delenv("FUZZY_MATCH", raising=False)
+    cards = [
+        _card("王小明", "能量叢林股份有限公司"), _card("Alice", "ACME"), _card("王小明", "能量叢林"), _card("王大明", "能量叢林"),
+    ]
+    assert cluster_cards(cards) == [[0, 2], [1], [3]]
+    monkeypatch.setenv("FUZZY_MATCH", "off")
+    assert cluster_cards(cards) == [[0], [1], [2], [3]]
+
+
+def test_fuzzy_match_keeps_the_stored_name_and_company(monkeypatch):
+    monkeypatch.delenv("FUZZY_MATCH", raising=False)
+    people = [_person(1, "陳志明", "能量叢林股份有限公司")]
+    card = _card("陳志明", "能量叢材股份公司", "+886912345678")
+    action, matched, updates = decide_action(card, ContactIndex(people))
+    assert action == "update" and matched is people[0]
+    assert list(updates) == ["phoneNumbers"]
+    (group,) = plan_batch([card], people)
+    assert group["data"]["organization"]["company"] == "能量叢林股份有限公司"
+    assert group["data"]["name"]["fullName"] == "陳志明"
+    # Without the phone there is nothing new: the typo alone is not an update.
+    assert decide_action(_card("陳志明", "能量叢材股份公司"), ContactIndex(people))[0] == "skip"
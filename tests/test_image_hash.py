@@ -0,0 +1,41 @@
+from PIL import Image, ImageDraw, ImageFont
+
+from services.image_hash import RecentHashes, fingerprint, group_near_duplicates, is_near_duplicate
+
+
+def _card(path, name, size=(900, 540), quality=90):
+    img = Image.new("RGB", (900, 540), color="white")
+    drw = ImageDraw.Draw(img)
+    font = ImageFont.load_default(size=24)
+    drw.rectangle((40, 40, 400, 200), fill=(30, 60, 120))
+    drw.text((60, 300), name, fill="black", font=font)
+    drw.text((60, 380), "ACME Inc.  +886 2 1234 5678", fill="black", font=font)
+    img.resize(size).save(path, format="JPEG", quality=quality)
+    return str(path)
+
+
+def test_recompressed_copy_is_duplicate_but_same_template_is_not(tmp_path):
+    original = fingerprint(_card(tmp_path / "a.jpg", "Alice Wang"))
+    copy = fingerprint(_card(tmp_path / "a2.jpg", "Alice Wang", size=(1800, 1080), quality=60))
+    coworker = fingerprint(_card(tmp_path / "b.jpg", "Alice Wong"))
+    assert is_near_duplicate(original, copy)
+    assert not is_near_duplicate(original, coworker)
+    assert group_near_duplicates([original, coworker, copy, None]) == [0, 1, 0, 3]
+
+
+def test_unreadable_image_has_no_fingerprint(tmp_path):
+    path = tmp_path / "x.jpg"
+    path.write_bytes(b"not an image")
+    assert fingerprint(str(path)) is None
+
+
+def test_recent_hashes_per_user(tmp_path):
+    recent = RecentHashes(per_user=1)
+    card = fingerprint(_card(tmp_path / "a.jpg", "Alice Wang"))
+    again = fingerprint(_card(tmp_path / "a2.jpg", "Alice Wang", quality=70))
+    other = fingerprint(_card(tmp_path / "b.jpg", "Bob Chen"))
+    recent.add("u1", card, "text")
+    assert recent.find("u1", again) == "text"
+    assert recent.find("u2", again) is None
+    recent.add("u1", other, "bob")
+    assert recent.find("u1", again) is None  # evicted
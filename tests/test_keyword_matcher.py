@@ -0,0 +1,40 @@
+import json
+import random
+
+from services.keyword_matcher import KeywordMatcher
+from services.parse_service import COMPANY_HINTS, TITLE_HINTS, build_hint_matcher, guess_company_title, load_hints
+
+
+def _naive(line, hints):
+    return {label for label, values in hints.items() if any(h in line for h in values)}
+
+
+def test_overlapping_hits_across_labels():
+    matcher = KeywordMatcher([("科技", "company"), ("技術長", "title"), ("股份有限公司", "company"), ("有限公司", "company")])
+    assert matcher.labels("星河科技術長") == {"company", "title"}
+    assert matcher.labels("能量叢林股份有限公司") == {"company"}
+    assert matcher.labels("王大明") == set()
+
+
+def test_matches_naive_scan_on_random_lines():
+    hints = {"company": COMPANY_HINTS, "title": TITLE_HINTS}
+    matcher = build_hint_matcher(hints)
+    rnd = random.Random(7)
+    pieces = COMPANY_HINTS + TITLE_HINTS + ["王", "大明", " ", "a", "C", "o", ".", "長", "科", "Inc."]
+    for _ in range(2000):
+        line = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 6)))
+        assert matcher.labels(line) == _naive(line, hints), line
+
+
+def test_hints_extendable_from_file(tmp_path):
+    extra = tmp_path / "hints.json"
+    extra.write_text(json.dumps({"company": ["株式会社"], "title": ["部長", "經理"]}, ensure_ascii=False), "utf-8")
+    hints = load_hints(None, str(extra))
+    assert hints == {"company": ["株式会社"], "title": ["部長", "經理"]}
+    matcher = build_hint_matcher(hints)
+    assert matcher.labels("山田商事株式会社 営業部長") == {"company", "title"}
+
+
+def test_guess_company_title_unchanged():
+    lines = ["王大明 營運長", "能量叢林股份有限公司", "Mobile: 0912-345-678"]
+    assert guess_company_title(lines) == ("能量叢林股份有限公司", "王大明 營運長")
@@ -0,0 +1,83 @@
+import json
+import os
+import time
+
+from services import match_key_cache as mkc
+from services.dedupe_service import ContactIndex, build_keys_from_person, decide_action
+
+
+def _person(idx, etag, phone="+886912345678"):
+    return {
+        "resourceName": f"people/c{idx}",
+        "etag": etag,
+        "names": [{"displayName": f"王{idx}"}],
+        "organizations": [{"name": "能量叢林"}],
+        "emailAddresses": [{"value": f"U{idx}@Example.com"}],
+        "phoneNumbers": [{"value": phone}],
+    }
+
+
+def test_keys_survive_restart_until_etag_changes(tmp_path, monkeypatch):
+    path = tmp_path / "user.json"
+    people = [_person(i, "e1") for i in range(3)]
+    cache = mkc.MatchKeyCache(path)
+    ContactIndex(people, key_cache=cache)
+    cache.save()
+    assert cache.misses == 3
+
+    calls = []
+    monkeypatch.setattr(mkc, "build_keys_from_person", lambda p: calls.append(p) or build_keys_from_person(p))
+    people[1] = _person(1, "e2", phone="0922111333")
+    cache = mkc.MatchKeyCache(path)
+    index = ContactIndex(people, key_cache=cache)
+    assert [p["resourceName"] for p in calls] == ["people/c1"]
+    assert cache.hits == 2
+    card = {"name": {"fullName": "王1"}, "organization": {"company": "能量叢林"}, "phones": [{"value": "0922-111-333"}]}
+    assert decide_action(card, index)[1] is people[1]
+
+
+def test_save_is_compact_versioned_and_drops_deleted_contacts(tmp_path):
+    path = tmp_path / "user.json"
+    cache = mkc.MatchKeyCache(path)
+    ContactIndex([_person(1, "e1"), _person(2, "e1")], key_cache=cache)
+    cache.save()
+    cache = mkc.MatchKeyCache(path)
+    ContactIndex([_person(2, "e1")], key_cache=cache)
+    cache.save()
+    data = json.loads(path.read_text("utf-8"))
+    assert data["version"] == mkc.KEY_VERSION
+    assert list(data["contacts"]) == ["people/c2"]
+    assert data["contacts"]["people/c2"][:2] == ["e1", ["u2@example.com"]]
+
+    path.write_text(json.dumps({"version": -1, "contacts": data["contacts"]}), "utf-8")
+    cache = mkc.MatchKeyCache(path)
+    ContactIndex([_person(2, "e1")], key_cache=cache)
+    assert cache.misses == 1
+
+
+def test_disabled_or_anonymous(monkeypatch):
+    assert mkc.get_key_cache(None) is None
+    monkeypatch.setenv("MATCH_KEY_CACHE", "off")
+    assert mkc.get_key_cache("a@b.com") is None
+
+
+def test_expired_file_is_deleted_and_logout_removes_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("MATCH_KEY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("MATCH_KEY_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+    cache = mkc.get_key_cache("a@b.com")
+    assert cache.ttl_seconds == mkc.MAX_TTL_SECONDS
+    ContactIndex([_person(1, "e1")], key_cache=cache)
+    cache.save()
+    day_old = time.time() - mkc.MAX_TTL_SECONDS - 60
+    os.utime(cache.path, (day_old, day_old))
+    cache = mkc.MatchKeyCache(cache.path)
+    ContactIndex([_person(1, "e1")], key_cache=cache)
+    assert cache.misses == 1 and not cache.path.exists()
+
+    cache.save()
+    other = tmp_path / "other.json"
+    other.write_text("{}", "utf-8")
+    os.utime(other, (day_old, day_old))
+    assert mkc.purge_expired(tmp_path) == 1 and cache.path.exists()
+    mkc.delete_key_cache("a@b.com")
+    assert not cache.path.exists()
@@ -0,0 +1,35 @@
+from services import phone_email_utils
+from services.phone_email_utils import (
+    clear_normalization_caches,
+    normalization_cache_stats,
+    normalize_phone,
+    validate_email,
+)
+
+
+def test_repeated_normalization_hits_cache(monkeypatch):
+    clear_normalization_caches()
+    calls = []
+    real = phone_email_utils.phonenumbers.parse
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(phone_email_utils.phonenumbers, "parse", counting)
+    for _ in range(5):
+        assert normalize_phone("0912-345-678") == "+886912345678"
+        assert validate_email(" DM.Wang@Example.com ") == "dm.wang@example.com"
+    assert len(calls) == 1
+    stats = normalization_cache_stats()
+    assert stats["phone"]["hits"] == 4 and stats["phone"]["size"] == 1
+    assert stats["email"]["hit_rate"] == 0.8
+
+
+def test_cache_is_keyed_on_region_and_clearable():
+    clear_normalization_caches()
+    assert normalize_phone("02 2345 6789", "TW") == "+886223456789"
+    assert normalize_phone("02 2345 6789", "US") != "+886223456789"
+    assert normalization_cache_stats()["phone"]["size"] == 2
+    clear_normalization_caches()
+    assert normalization_cache_stats()["phone"]["size"] == 0
@@ -0,0 +1,119 @@
+import threading
+import time
+
+from services import ocr_service
+
+
+class _FakeClient:
+    def __init__(self, handler):
+        self.handler = handler
+
+    def annotate(self, entries, api_key):
+        return self.handler(entries)
+
+
+def _write_images(tmp_path, sizes):
+    paths = []
+    for idx, size in enumerate(sizes):
+        path = tmp_path / f"card{idx}.png"
+        path.write_bytes(bytes([idx]) * size)
+        paths.append(str(path))
+    return paths
+
+
+def test_extract_text_many_keeps_order_and_runs_concurrently(monkeypatch):
+    monkeypatch.delenv("VISION_API_KEY", raising=False)
+    monkeypatch.setenv("OCR_CACHE", "off")
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_fallback(path):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return f"text:{path}"
+
+    monkeypatch.setattr(ocr_service, "_extract_with_fallback", fake_fallback)
+    paths = [f"card{i}.png" for i in range(4)]
+    assert ocr_service.extract_text_many(paths) == [f"text:{p}" for p in paths]
+    assert active["peak"] > 1
+
+
+def test_extract_text_many_empty():
+    assert ocr_service.extract_text_many([]) == []
+
+
+def test_vision_batch_single_call_maps_responses(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_annotate(entries):
+        calls.append(entries)
+        return [
+            {"fullTextAnnotation": {"text": f"card-{i}"}} if i != 1 else {"error": {"code": 3}}
+            for i in range(len(entries))
+        ]
+
+    monkeypatch.setenv("VISION_API_KEY", "k")
+    monkeypatch.setenv("OCR_CACHE", "off")
+    monkeypatch.setattr(ocr_service.vision_client, "get_client", lambda: _FakeClient(fake_annotate))
+    monkeypatch.setattr(ocr_service, "_extract_with_fallback", lambda path: "fallback")
+    paths = _write_images(tmp_path, [10, 10, 10])
+    assert ocr_service.extract_text_many(paths) == ["card-0", "fallback", "card-2"]
+    assert len(calls) == 1 and len(calls[0]) == 3
+
+
+def test_vision_batches_split_on_count_and_size(monkeypatch, tmp_path):
+    paths = _write_images(tmp_path, [10] * 20)
+    sizes = [len(entries) for _, entries in ocr_service._vision_batches(paths)]
+    assert sizes == [16, 4]
+
+    monkeypatch.setenv("VISION_MAX_REQUEST_BYTES", "400")
+    paths = _write_images(tmp_path, [150, 150, 150])
+    batches = list(ocr_service._vision_batches(paths))
+    assert [indices for indices, _ in batches] == [[0], [1], [2]]
+
+
+def test_vision_multiple_calls_map_back_to_cards(monkeypatch, tmp_path):
+    def fake_annotate(entries):
+        return [{"fullTextAnnotation": {"text": entry["image"]["content"]}} for entry in entries]
+
+    monkeypatch.setenv("VISION_API_KEY", "k")
+    monkeypatch.setenv("OCR_CACHE", "off")
+    monkeypatch.setattr(ocr_service.vision_client, "get_client", lambda: _FakeClient(fake_annotate))
+    paths = _write_images(tmp_path, [10] * 40)
+    expected = [ocr_service.base64.b64encode(bytes([i]) * 10).decode() for i in range(40)]
+    assert ocr_service.extract_text_many(paths) == expected
+
+
+def test_ocr_jobs_stay_bounded_across_concurrent_batches(monkeypatch):
+    monkeypatch.delenv("VISION_API_KEY", raising=False)
+    monkeypatch.setenv("OCR_CACHE", "off")
+    monkeypatch.setenv("OCR_MAX_WORKERS", "2")
+    monkeypatch.setattr(ocr_service, "_executor", None)
+    monkeypatch.setattr(ocr_service, "_slots", None)
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_fallback(path):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return f"text:{path}"
+
+    monkeypatch.setattr(ocr_service, "_extract_with_fallback", fake_fallback)
+    # Single-card batches run inline on the caller's thread; they share the same slots.
+    batches = [[f"u{user}-c{card}.png" for card in range(user % 2 + 1)] for user in range(6)]
+    threads = [threading.Thread(target=ocr_service.extract_text_many, args=(batch,)) for batch in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert active["peak"] == 2
+    ocr_service._executor.shutdown(wait=True)
@@ -0,0 +1,74 @@
+import os
+import time
+
+from services import ocr_cache, ocr_service
+from services.ocr_cache import OcrCache
+
+
+def test_memory_lru_and_disk_tier(tmp_path):
+    cache = OcrCache(tmp_path, memory_items=1)
+    cache.put("a", "text a")
+    cache.put("b", "text b")
+    assert cache.get("b") == "text b"  # memory
+    assert cache.get("a") == "text a"  # evicted from memory, served from disk
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["memory_items"] == 1
+
+
+def test_disk_budget_and_ttl_eviction(tmp_path):
+    cache = OcrCache(tmp_path, memory_items=0, disk_bytes=10, ttl_seconds=60)
+    cache.put("old", "123456")
+    old = time.time() - 30
+    os.utime(tmp_path / "old.txt", (old, old))
+    cache.put("new", "abcdef")
+    assert cache.get("old") is None
+    assert cache.get("new") == "abcdef"
+
+    expired = time.time() - 120
+    os.utime(tmp_path / "new.txt", (expired, expired))
+    assert cache.get("new") is None
+
+
+def test_cache_key_depends_on_bytes_and_engine(tmp_path):
+    a = tmp_path / "a.png"
+    b = tmp_path / "b.png"
+    a.write_bytes(b"same")
+    b.write_bytes(b"same")
+    assert ocr_cache.cache_key(str(a), "vision") == ocr_cache.cache_key(str(b), "vision")
+    assert ocr_cache.cache_key(str(a), "vision") != ocr_cache.cache_key(str(a), "fallback:tesseract")
+    assert ocr_cache.cache_key(str(tmp_path / "nope.png"), "vision") is None
+
+
+def test_repeat_upload_skips_ocr(monkeypatch, tmp_path):
+    cache = OcrCache(tmp_path / "cache")
+    monkeypatch.setattr(ocr_cache, "get_cache", lambda: cache)
+    monkeypatch.delenv("VISION_API_KEY", raising=False)
+    calls = []
+
+    def fake_fallback(path):
+        calls.append(path)
+        return "王大明"
+
+    monkeypatch.setattr(ocr_service, "_extract_with_fallback", fake_fallback)
+    first = tmp_path / "first.png"
+    again = tmp_path / "again.png"
+    first.write_bytes(b"card-bytes")
+    again.write_bytes(b"card-bytes")
+    assert ocr_service.extract_text(str(first)) == "王大明"
+    assert ocr_service.extract_text(str(again)) == "王大明"
+    assert calls == [str(first)]
+
+
+def test_ttl_is_capped_and_expired_files_are_purged(tmp_path):
+    assert OcrCache(tmp_path, ttl_seconds=7 * 24 * 3600).ttl_seconds == ocr_cache.MAX_TTL_SECONDS
+    assert OcrCache(tmp_path, ttl_seconds=0).ttl_seconds == ocr_cache.MAX_TTL_SECONDS
+    stale = tmp_path / "stale.txt"
+    stale.write_text("old card", "utf-8")
+    expired = time.time() - ocr_cache.MAX_TTL_SECONDS - 60
+    os.utime(stale, (expired, expired))
+    cache = OcrCache(tmp_path, memory_items=0)
+    cache.put("fresh", "new card")
+    assert not stale.exists()
+    assert cache.get("fresh") == "new card"
@@ -0,0 +1,41 @@
+from io import BytesIO
+
+from PIL import Image
+
+from services import ocr_service
+
+
+def _save(tmp_path, img, name="card.png", **kwargs):
+    path = tmp_path / name
+    img.save(path, **kwargs)
+    return str(path)
+
+
+def test_large_photo_downscaled_to_grayscale_jpeg(tmp_path):
+    path = _save(tmp_path, Image.new("RGB", (4000, 2400), color=(250, 240, 230)))
+    out = ocr_service.prepare_image_bytes(path)
+    with Image.open(BytesIO(out)) as img:
+        assert img.format == "JPEG"
+        assert img.mode == "L"
+        assert max(img.size) == ocr_service.DEFAULT_MAX_EDGE
+
+
+def test_max_edge_configurable_and_exif_rotation_applied(monkeypatch, tmp_path):
+    monkeypatch.setenv("OCR_MAX_EDGE", "1000")
+    img = Image.new("RGB", (3000, 1500), color="white")
+    exif = img.getexif()
+    exif[0x0112] = 6  # rotate 90 degrees on display
+    path = _save(tmp_path, img, name="card.jpg", exif=exif)
+    with Image.open(BytesIO(ocr_service.prepare_image_bytes(path))) as out:
+        assert out.size == (500, 1000)
+
+
+def test_non_image_and_disabled_keep_original_bytes(monkeypatch, tmp_path):
+    blob = tmp_path / "card.pdf"
+    blob.write_bytes(b"%PDF-1.4 not an image")
+    assert ocr_service.prepare_image_bytes(str(blob)) == b"%PDF-1.4 not an image"
+
+    path = _save(tmp_path, Image.new("RGB", (4000, 2400), color="white"))
+    monkeypatch.setenv("OCR_PREPROCESS", "off")
+    with open(path, "rb") as f:
+        assert ocr_service.prepare_image_bytes(path) == f.read()
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from services import parse_service
+from services.parse_service import ENTITY_RE, parse_text_to_schema
+
+MB = 1_000_000
+
+ADVERSARIAL = {
+    "digits": "1" * MB,
+    "letters": "a" * MB,
+    "spaced_digits": "12 " * (MB // 3),
+    "at_signs": "a@" * (MB // 2),
+    "dotted_domain": "a@" + "b." * (MB // 2),
+    "parens": "(12)" * (MB // 4),
+    "email_chars": "a1.@-+" * (MB // 6),
+}
+
+
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL))
+def test_scanner_is_linear_on_1mb_garbage(name):
+    # Quadratic backtracking takes minutes here; linear scanning well under a second.
+    start = time.perf_counter()
+    for _ in ENTITY_RE.finditer(ADVERSARIAL[name]):
+        pass
+    assert time.perf_counter() - start < 5
+
+
+def test_parse_clips_input_to_budget(monkeypatch):
+    start = time.perf_counter()
+    parse_text_to_schema("1" * MB)
+    assert time.perf_counter() - start < 1
+
+    monkeypatch.setattr(parse_service, "MAX_TEXT_LINES", 3)
+    data = parse_text_to_schema("Amy\nACME Inc.\nCTO\njane@acme.example")
+    assert data["emails"] == []
+
+
+def test_overlong_local_part_is_not_truncated_into_an_email():
+    data = parse_text_to_schema("x" * 80 + "@example.com")
+    assert data["emails"] == []
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.card_corpus import generate_cards
+from scripts.parse_benchmark import compare
+from services.parse_service import parse_text_to_schema
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_corpus_is_seeded_and_mixes_card_kinds():
+    cards = generate_cards(30, seed=5)
+    assert cards == generate_cards(30, seed=5)
+    assert cards != generate_cards(30, seed=6)
+    assert any("股份有限公司" in c for c in cards) and any("Tel:" in c for c in cards)
+
+
+def test_parser_handles_noisy_corpus():
+    for text in generate_cards(90, seed=2, noise=0.2):
+        data = parse_text_to_schema(text)
+        assert data["name"]["fullName"]
+
+
+def test_compare_flags_only_slowdowns_past_threshold():
+    baseline = {"a": 10.0, "b": 10.0, "c": 10.0}
+    assert compare({"a": 8.0, "b": 7.0, "c": 20.0}, baseline, 0.25) == ["b"]
+
+
+def test_compare_widens_allowance_by_measured_noise():
+    baseline = {"a": 10.0, "b": 10.0}
+    assert compare({"a": 7.0, "b": 7.0}, baseline, 0.25, {"a": 0.05, "b": 0.01}) == ["b"]
+    # However noisy the run, the allowance stops at twice the threshold.
+    assert compare({"a": 4.9, "b": 5.1}, baseline, 0.25, {"a": 0.9, "b": 0.9}) == ["a"]
+
+
+@pytest.mark.skipif(not os.getenv("PARSE_BENCH"), reason="set PARSE_BENCH=1 to run the parser performance check")
+def test_parse_speed_within_baseline():
+    result = subprocess.run(
+        [sys.executable, str(ROOT / "scripts" / "parse_benchmark.py"), "--check", "--cards", "1000"],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,31 @@
+from services import parse_service
+from services.parse_service import parse_many, parse_text_to_schema
+
+CARDS = [
+    "王大明 營運長\n能量叢林股份有限公司\nMobile: 0912-345-678\nEmail: dm.wang@example.com\n台北市大安區仁愛路三段 100 號",
+    "Jane Smith\nCTO\nAcme International Inc.\nTel: +1 415-555-0100\njane@acme.example",
+    "",
+    "林小華 經理\n星河資訊科技有限公司\nTel: 0912-345-678\nhua.lin@galaxy.example",
+]
+
+
+def test_parse_many_matches_single_card_parsing():
+    assert parse_many(CARDS) == [parse_text_to_schema(t) for t in CARDS]
+
+
+def test_parse_many_normalizes_shared_values_once(monkeypatch):
+    calls = []
+    real = parse_service.normalize_phone
+
+    def counting(value, *args, **kwargs):
+        calls.append(value)
+        return real(value, *args, **kwargs)
+
+    monkeypatch.setattr(parse_service, "normalize_phone", counting)
+    parse_many([CARDS[0], CARDS[3]])
+    assert calls.count("0912-345-678") == 1
+
+
+def test_parse_many_process_pool_keeps_order():
+    texts = CARDS * 6
+    assert parse_many(texts, processes=2, chunk_size=5) == parse_many(texts, processes=1)
@@ -0,0 +1,38 @@
+import csv
+
+from services.parse_service import parse_many, parse_text_to_schema
+from services.parse_timing import STAGES, StageTimings
+
+CARD = "王大明 營運長\n能量叢林股份有限公司\nMobile: 0912-345-678\nEmail: dm.wang@example.com\n台北市大安區仁愛路三段 100 號"
+
+
+def test_hook_sees_every_stage_and_does_not_change_result():
+    timings = StageTimings()
+    assert parse_text_to_schema(CARD, hook=timings) == parse_text_to_schema(CARD)
+    assert list(timings.samples) == list(STAGES)
+    assert all(len(v) == 1 and v[0] >= 0 for v in timings.samples.values())
+
+
+def test_timings_from_worker_processes_are_replayed():
+    timings = StageTimings()
+    parse_many([CARD] * 6, processes=2, chunk_size=3, hook=timings)
+    assert all(len(timings.samples[stage]) == 6 for stage in STAGES)
+
+
+def test_summary_and_csv(tmp_path):
+    timings = StageTimings()
+    for ms in range(1, 101):
+        timings("phones", ms / 1000)
+    row = timings.summary()[0]
+    assert row["count"] == 100 and row["p50_ms"] == 50 and row["p95_ms"] == 95 and row["p99_ms"] == 99
+    path = timings.save_csv(str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        assert next(csv.DictReader(f))["stage"] == "phones"
+
+
+def test_batches_saved_in_the_same_second_keep_separate_files(tmp_path):
+    first, second = StageTimings(), StageTimings()
+    first("name", 0.001)
+    second("address", 0.002)
+    assert first.save_csv(str(tmp_path)) != second.save_csv(str(tmp_path))
+    assert len(list(tmp_path.glob("parse-timings-*.csv"))) == 2
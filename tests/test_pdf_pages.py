@@ -0,0 +1,39 @@
+import pytest
+from PIL import Image
+
+from services.pdf_service import is_pdf, iter_pdf_pages, pdf_page_count
+
+pytest.importorskip("pypdfium2")
+
+
+def test_pdf_pages_become_separate_images(tmp_path):
+    pages = [Image.new("RGB", (360, 200), color=c) for c in ("white", "gray", "black")]
+    pdf_path = tmp_path / "cards.pdf"
+    pages[0].save(pdf_path, format="PDF", save_all=True, append_images=pages[1:], resolution=72)
+    assert is_pdf(str(pdf_path))
+
+    out = list(iter_pdf_pages(str(pdf_path), dpi=144))
+    assert [p.rsplit("_", 1)[-1] for p in out] == ["p1.png", "p2.png", "p3.png"]
+    with Image.open(out[0]) as img:
+        assert img.size == (720, 400)
+        assert img.mode == "L"
+
+
+def test_pdf_page_limit_and_lazy_iteration(tmp_path):
+    pages = [Image.new("RGB", (100, 60), color="white") for _ in range(5)]
+    pdf_path = tmp_path / "many.pdf"
+    pages[0].save(pdf_path, format="PDF", save_all=True, append_images=pages[1:])
+
+    assert pdf_page_count(str(pdf_path)) == 5
+    assert pdf_page_count(str(pdf_path), max_pages=3) == 3
+    iterator = iter_pdf_pages(str(pdf_path), out_dir=str(tmp_path), max_pages=3)
+    first = next(iterator)
+    assert first.endswith("many_p1.png")
+    assert not (tmp_path / "many_p2.png").exists()
+    assert len([first, *iterator]) == 3
+
+
+def test_is_pdf_rejects_images(tmp_path):
+    path = tmp_path / "card.png"
+    Image.new("RGB", (10, 10)).save(path)
+    assert not is_pdf(str(path))
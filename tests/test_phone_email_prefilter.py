@@ -0,0 +1,40 @@
+import random
+
+from services import phone_email_utils as u
+
+
+def test_phone_prefilter_matches_full_validation():
+    rnd = random.Random(7)
+    alphabet = "0123456789" * 4 + "+-() .#xX/ABC０１"
+    for _ in range(3000):
+        value = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 16)))
+        if rnd.random() < 0.3:
+            value = rnd.choice(["09", "+886", "02", "00", "+1", "011"]) + value
+        region = rnd.choice(["TW", "US", "GB", "AR", "NU"])
+        candidate = u._phone_candidate(value, region)
+        expected = u._normalize_phone_full(candidate, region)
+        assert u._normalize_phone_cached.__wrapped__(value, region) == expected, (value, region)
+
+
+def test_phone_prefilter_rejects_short_numbers():
+    assert not u._phone_plausible("106", "TW")
+    assert u._phone_plausible("20241016", "TW")  # 8 digits still go to phonenumbers
+    assert not u._phone_plausible("123456", "TW")
+    assert u._phone_plausible("00886223456789", "TW")  # IDD switches region, so no length check
+    assert u.normalize_phone("123456") is None
+
+
+def test_email_prefilter_matches_full_validation():
+    rnd = random.Random(7)
+    chars = "ab.@-_+1。é"
+    for _ in range(2000):
+        email = "".join(rnd.choice(chars) for _ in range(rnd.randint(1, 12)))
+        if rnd.random() < 0.5:
+            email = rnd.choice(["a", "a.b", "用户", ".x"]) + "@" + rnd.choice(["x.com", "x", "例子.广告", "x..com", "x.com."])
+        assert u._validate_email_cached.__wrapped__(email) == u._validate_email_full(email), email
+
+
+def test_email_prefilter_rejects_obvious_non_addresses():
+    for email in ["a@b", "@x.com", "a@", "a@b@c.com", ".a@x.com", "a..b@x.com", "a@x.com."]:
+        assert not u._email_plausible(email)
+    assert u._email_plausible("a@example。com")
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from PIL import Image
+
+from services import tesseract_pool
+from services.tesseract_pool import TesseractPool
+
+
+class _FakeApi:
+    created = 0
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def __init__(self, lang=None):
+        with _FakeApi.lock:
+            _FakeApi.created += 1
+        self.lang = lang
+        self.image = None
+
+    def SetImage(self, img):
+        self.image = img.size
+
+    def GetUTF8Text(self):
+        with _FakeApi.lock:
+            _FakeApi.active += 1
+            _FakeApi.peak = max(_FakeApi.peak, _FakeApi.active)
+        time.sleep(0.02)
+        with _FakeApi.lock:
+            _FakeApi.active -= 1
+        return f"{self.lang}:{self.image[0]}"
+
+    def Clear(self):
+        self.image = None
+
+    def End(self):
+        pass
+
+
+class _FakeTesserocr:
+    PyTessBaseAPI = _FakeApi
+
+
+def test_engines_are_reused_and_bounded(monkeypatch, tmp_path):
+    monkeypatch.setattr(tesseract_pool, "tesserocr", _FakeTesserocr)
+    path = tmp_path / "card.png"
+    Image.new("RGB", (40, 20), color="white").save(path)
+
+    pool = TesseractPool(size=2, lang="chi_tra+eng")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.recognize(str(path)))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["chi_tra+eng:40"] * 8
+    assert _FakeApi.created <= 2
+    assert 1 <= _FakeApi.peak <= 2
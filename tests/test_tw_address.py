@@ -0,0 +1,24 @@
+from services import tw_address
+from services.parse_service import guess_address, parse_text_to_schema
+
+
+def test_address_beats_phone_and_tax_id_lines():
+    text = "王大明\n能量叢林股份有限公司\n臺中市西屯區文心路三段 241 號 5 樓\n電話：04-2345-6789 分機 123\n統一編號：12345678"
+    data = parse_text_to_schema(text)
+    assert data["addresses"][0]["formatted"].startswith("臺中市西屯區")
+
+
+def test_scoring_tolerates_ocr_spacing_and_variants():
+    assert tw_address.address_score("台 北市大安 區仁愛路三段100號") >= tw_address.MIN_SCORE
+    assert tw_address.address_score("統一編號：12345678") < tw_address.MIN_SCORE
+    assert tw_address.address_score("網路科技股份有限公司") < tw_address.MIN_SCORE
+
+
+def test_fallback_keeps_foreign_addresses_and_skips_contact_lines():
+    lines = ["Jane Smith", "1164 Sunset Ave, Suite 136, Singapore 048583", "Fax: +65 6123 4567 ext 89"]
+    assert guess_address(lines) == lines[1]
+    assert guess_address(["Jane Smith", "Mobile: 12 34 56 78 90 12"]) is None
+
+
+def test_matcher_is_built_once():
+    assert tw_address.get_matcher() is tw_address.get_matcher()
@@ -0,0 +1,54 @@
+import pytest
+
+from services.people_service import PeopleService, is_etag_conflict
+
+
+class _HttpError(Exception):
+    def __init__(self, status, content):
+        super().__init__(content)
+        self.resp = type("Resp", (), {"status": status})()
+        self.content = content
+
+
+class _Service(PeopleService):
+    def __init__(self, current_etag, fail=None):
+        self.current_etag = current_etag
+        self.fail = fail
+        self.reads = 0
+        self.sent = []
+
+    def get_contact(self, resource_name):
+        self.reads += 1
+        return {"resourceName": resource_name, "metadata": {"sources": [{"etag": self.current_etag}]}}
+
+    def update_contact(self, resource_name, data, etag=None):
+        self.sent.append(etag)
+        if self.fail:
+            raise self.fail
+        if etag != self.current_etag:
+            raise _HttpError(400, b'{"error": {"status": "FAILED_PRECONDITION"}}')
+        return {"resourceName": resource_name, "etag": "next"}
+
+
+def test_snapshot_etag_is_used_without_reading_the_contact():
+    svc = _Service("e1")
+    assert svc.update_contact_or_refresh("people/c1", {}, "e1")["etag"] == "next"
+    assert svc.reads == 0 and svc.sent == ["e1"]
+
+
+def test_stale_or_missing_etag_reads_the_contact_once():
+    svc = _Service("e2")
+    svc.update_contact_or_refresh("people/c1", {}, "e1")
+    assert svc.reads == 1 and svc.sent == ["e1", "e2"]
+    svc = _Service("e2")
+    svc.update_contact_or_refresh("people/c1", {}, None)
+    assert svc.reads == 1 and svc.sent == ["e2"]
+
+
+def test_other_errors_are_not_retried():
+    svc = _Service("e1", fail=_HttpError(403, b"PERMISSION_DENIED"))
+    with pytest.raises(_HttpError):
+        svc.update_contact_or_refresh("people/c1", {}, "e1")
+    assert svc.reads == 0
+    assert is_etag_conflict(_HttpError(409, b""))
+    assert not is_etag_conflict(_HttpError(400, b"INVALID_ARGUMENT"))
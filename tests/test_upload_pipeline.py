@@ -0,0 +1,82 @@
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from services import ocr_service, upload_pipeline
+from services.pdf_service import PdfError
+
+pytest.importorskip("pypdfium2")
+
+
+def _card_image(name, size=(900, 540)):
+    img = Image.new("RGB", (900, 540), color="white")
+    drw = ImageDraw.Draw(img)
+    drw.rectangle((40, 40, 400, 200), fill=(30, 60, 120))
+    drw.text((60, 300), name, fill="black", font=ImageFont.load_default(size=24))
+    return img.resize(size)
+
+
+def _fake_ocr(monkeypatch):
+    calls = []
+
+    def extract(paths):
+        calls.append([p.rsplit("/", 1)[-1] for p in paths])
+        return [f"text of {p.rsplit('/', 1)[-1]}" for p in paths]
+
+    monkeypatch.setattr(ocr_service, "extract_text_many", extract)
+    return calls
+
+
+def test_pages_stream_into_ocr_and_count_against_the_batch(tmp_path, monkeypatch):
+    monkeypatch.delenv("OCR_DUP_DETECTION", raising=False)
+    calls = _fake_ocr(monkeypatch)
+    photo = tmp_path / "photo.png"
+    _card_image("Alice Wang").save(photo)
+    pdf = tmp_path / "scan.pdf"
+    pages = [_card_image(name) for name in ("Bob Chen", "Carol Lin", "Dan Wu")]
+    pages[0].save(pdf, format="PDF", save_all=True, append_images=pages[1:])
+
+    assert upload_pipeline.count_cards([str(photo), str(pdf)]) == 4
+    names, paths, texts, duplicates = upload_pipeline.dedupe_and_ocr("", ["photo.png", "scan.pdf"], [str(photo), str(pdf)])
+    assert names == ["photo.png", "scan.pdf（第 1 頁）", "scan.pdf（第 2 頁）", "scan.pdf（第 3 頁）"]
+    # The photo goes with the first rendered page; every later page is its own OCR job.
+    assert calls == [["photo.png", "scan_p1.png"], ["scan_p2.png"], ["scan_p3.png"]]
+    assert texts == [f"text of {p.rsplit('/', 1)[-1]}" for p in paths]
+    assert duplicates == [] and not pdf.exists()
+
+
+def test_duplicates_keep_the_first_cards_text(tmp_path, monkeypatch):
+    monkeypatch.delenv("OCR_DUP_DETECTION", raising=False)
+    calls = _fake_ocr(monkeypatch)
+    files = []
+    for fname, name, size in (("a.png", "Alice Wang", (900, 540)), ("b.png", "Bob Chen", (900, 540)),
+                              ("a2.png", "Alice Wang", (1800, 1080))):
+        _card_image(name, size).save(tmp_path / fname)
+        files.append(str(tmp_path / fname))
+    names, paths, texts, duplicates = upload_pipeline.dedupe_and_ocr("", ["a.png", "b.png", "a2.png"], files)
+    assert calls == [["a.png", "b.png"]]
+    assert paths == files and texts == ["text of a.png", "text of b.png", "text of a.png"]
+    assert duplicates == [{"index": 2, "filename": "a2.png", "duplicate_of": "a.png"}]
+
+
+def test_rendered_pages_are_removed_when_rendering_fails(tmp_path, monkeypatch):
+    _fake_ocr(monkeypatch)
+    page = tmp_path / "scan_p1.png"
+
+    def broken_pages(path):
+        _card_image("Bob Chen").save(page)
+        yield str(page)
+        raise PdfError("page 2: damaged")
+
+    monkeypatch.setattr(upload_pipeline, "iter_pdf_pages", broken_pages)
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n")
+    with pytest.raises(PdfError):
+        upload_pipeline.dedupe_and_ocr("", ["scan.pdf"], [str(pdf)])
+    assert not page.exists()
+
+
+def test_unreadable_pdf_is_a_pdf_error(tmp_path):
+    pdf = tmp_path / "bad.pdf"
+    pdf.write_bytes(b"%PDF-1.4\ngarbage")
+    with pytest.raises(PdfError):
+        upload_pipeline.count_cards([str(pdf)])
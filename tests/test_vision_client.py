@@ -0,0 +1,62 @@
+import pytest
+import requests
+
+from services import vision_client
+from services.vision_client import VisionClient, VisionError
+
+
+class _Resp:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+
+class _Session:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def post(self, url, params=None, json=None, timeout=None):
+        self.calls.append({"url": url, "params": params, "timeout": timeout})
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(vision_client.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_retries_transient_errors_then_succeeds(no_sleep):
+    ok = _Resp(200, {"responses": [{"fullTextAnnotation": {"text": "hi"}}]})
+    session = _Session([_Resp(503), requests.ConnectionError("reset"), _Resp(429, headers={"Retry-After": "2"}), ok])
+    client = VisionClient(session=session, connect_timeout=1, read_timeout=9)
+    assert client.annotate([{}], "key") == [{"fullTextAnnotation": {"text": "hi"}}]
+    assert len(session.calls) == 4
+    assert session.calls[0]["timeout"] == (1, 9)
+    assert session.calls[0]["params"] == {"key": "key"}
+    assert no_sleep[2] == 2.0
+    assert all(0 <= s <= client.backoff_max for s in no_sleep)
+
+
+def test_non_retryable_status_fails_fast():
+    session = _Session([_Resp(403)])
+    with pytest.raises(VisionError) as exc:
+        VisionClient(session=session).annotate([{}], "key")
+    assert exc.value.status_code == 403
+    assert len(session.calls) == 1
+
+
+def test_gives_up_after_max_retries():
+    session = _Session([_Resp(503)] * 3)
+    with pytest.raises(VisionError):
+        VisionClient(session=session, max_retries=2).annotate([{}], "key")
+    assert len(session.calls) == 3